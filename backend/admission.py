@@ -0,0 +1,184 @@
+"""
+CineAI Pro - Kabul Kontrolü (Admission Control)
+
+Tahmin işleri event loop yerine sınırlı sayıda worker thread'inde çalışır:
+* En fazla `max_in_flight` iş aynı anda işlenir, en fazla `max_queue` istek sırada
+  bekler. Sıra doluysa istek hiç beklemeden reddedilir (Overloaded -> 429).
+* Her isteğin geldiği andan başlayan bir süresi (Deadline) vardır. Süre sırada
+  beklerken ya da işlenirken dolarsa istek DeadlineExceeded ile biter (503).
+  Python thread'leri dışarıdan durdurulamadığı için iş, bir sonraki aşama
+  sınırında (çeviri parçaları, temizleme, vektörleştirme, tahmin) kendini bırakır;
+  slot ancak iş gerçekten bitince serbest kalır, böylece eşzamanlılık sınırı aşılmaz.
+* İstek geldiğinde sıra `degrade_queue_depth` kadar doluysa iş "degraded" modlarla
+  çalışır (çevirinin atlanması, en ucuz modele düşülmesi).
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import PREDICT_IN_FLIGHT, PREDICT_QUEUED, PREDICT_STAGE_SECONDS
+
+DEGRADED_MODES = ("skip_translation", "cheap_model")
+
+
+class Overloaded(Exception):
+    """Sıra dolu - istek işlenmeden reddedildi"""
+
+
+class DeadlineExceeded(Exception):
+    """İsteğin süresi doldu; mesaj sürenin dolduğu aşamadır"""
+
+
+class Deadline:
+    """İsteğin geldiği andan itibaren ölçülen süre sınırı (seconds <= 0 ise sınırsız)"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds > 0 else None
+        # İşin en son kontrol edilen aşaması (süre dolunca hangi aşamada kaldığı)
+        self.stage = "queue"
+
+    def remaining(self):
+        """Kalan süre (saniye, negatif olabilir) veya sınırsızsa None"""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def timeout(self):
+        """wait/wait_for için zaman aşımı: sınırsızsa None, dolmuşsa 0"""
+        remaining = self.remaining()
+        return None if remaining is None else max(0.0, remaining)
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        """Aşamayı kaydet; süre dolduysa işi bu aşamada bırak"""
+        self.stage = stage
+        if self.expired():
+            raise DeadlineExceeded(stage)
+
+
+def parse_degraded_modes(spec: str) -> frozenset:
+    """'skip_translation,cheap_model' -> frozenset; 'off'/boş -> boş küme"""
+    modes = {m.strip() for m in spec.split(",") if m.strip() and m.strip() != "off"}
+    unknown = modes - set(DEGRADED_MODES)
+    if unknown:
+        raise ValueError(f"Bilinmeyen degraded mod(lar): {', '.join(sorted(unknown))}")
+    return frozenset(modes)
+
+
+class AdmissionController:
+    """
+    Sınırlı eşzamanlılık + sınırlı sıra. Tüm sayaçlar yalnızca event loop
+    thread'inde değişir; bu yüzden kilit gerekmez.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int,
+                 degraded_modes=frozenset(), degrade_queue_depth: int = None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.degraded_modes = frozenset(degraded_modes)
+        self.degrade_queue_depth = degrade_queue_depth
+        self.in_flight = 0
+        self._waiters = deque()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="predict")
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self):
+        PREDICT_IN_FLIGHT.set(self.in_flight)
+        PREDICT_QUEUED.set(len(self._waiters))
+
+    def _degraded_for_new_request(self) -> frozenset:
+        if not self.degraded_modes or self.degrade_queue_depth is None:
+            return frozenset()
+        if len(self._waiters) < self.degrade_queue_depth:
+            return frozenset()
+        return self.degraded_modes
+
+    async def _acquire(self, deadline: Deadline):
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self._publish()
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise Overloaded()
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        timeout = deadline.timeout()
+        timer = loop.call_later(timeout, self._expire, waiter) if timeout is not None else None
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Slot devredildikten sonra iptal edildiyse slotu geri ver
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._release()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._publish()
+
+    def _expire(self, waiter):
+        if not waiter.done():
+            waiter.set_exception(DeadlineExceeded("queue"))
+
+    def _release(self):
+        # Slot sayacı düşmeden doğrudan sıradaki bekleyene devredilir (FIFO)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._publish()
+                return
+        self.in_flight -= 1
+        self._publish()
+
+    def _job_done(self, future):
+        if not future.cancelled():
+            future.exception()  # süresi dolmuş işlerin hatası "never retrieved" uyarısı vermesin
+        self._release()
+
+    async def run(self, fn, deadline: Deadline):
+        """
+        `fn(deadline, degraded_modes)` fonksiyonunu bir worker thread'inde çalıştırır.
+        Sıra doluysa Overloaded, süre dolarsa DeadlineExceeded fırlatır. Degraded
+        modlar yalnızca önerilir; `fn` uygulayabildiklerini kendisi sayar.
+        """
+        degraded = self._degraded_for_new_request()
+        queued_at = time.perf_counter()
+        await self._acquire(deadline)
+        PREDICT_STAGE_SECONDS.observe(time.perf_counter() - queued_at, "queue")
+        try:
+            deadline.check("queue")
+        except DeadlineExceeded:
+            self._release()
+            raise
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor, fn, deadline, degraded)
+        future.add_done_callback(self._job_done)
+        try:
+            # shield: süre dolunca yalnızca bekleme biter; slot iş bitince _job_done ile bırakılır
+            return await asyncio.wait_for(asyncio.shield(future), deadline.timeout())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(deadline.stage) from None
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "degraded_modes": sorted(self.degraded_modes),
+            "degrade_queue_depth": self.degrade_queue_depth,
+        }
@@ -0,0 +1,271 @@
+"""
+CineAI Pro - Toplu (Offline) Skorlama
+
+Bir CSV/Parquet film özeti dosyasını parça parça okur, servis ile aynı
+clean_text + final_vectorizer.pkl + final_best_model.pkl yolundan geçirir ve
+tahminleri ilk 5 olasılıkla birlikte artımlı olarak CSV'ye yazar.
+
+* Parçalar bir süreç havuzuna dağıtılır; model her worker'da yalnızca bir kez yüklenir.
+* Aynı anda en fazla `2 x workers` parça bellekte tutulur (sınırlı bellek).
+* Her parçadan sonra `<output>.progress.json` güncellenir; --resume ile kesintiden devam edilir.
+* --translate ile metinler önce İngilizceye çevrilir; çeviriler SQLite önbelleğinde saklanır.
+
+Örnek:
+    python bulk_score.py katalog.csv tahminler.csv --text-column plot --id-column id --workers 4
+    python bulk_score.py katalog.parquet tahminler.csv --translate --resume
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import pandas as pd
+
+from inference import class_probabilities, clean_text, top_k
+from model_store import MODEL_PATH, VECTORIZER_PATH
+from text_normalization import LEMMA_TABLE_PATH, LemmaTable
+from translation import translate_chunks, translation_budget
+
+TOP_K = 5
+
+# Worker süreç başına bir kez yüklenen durum
+_worker = {}
+
+
+# --- ÇEVİRİ ÖNBELLEĞİ ---
+class TranslationCache:
+    """Metin hash'ine göre çeviri saklayan SQLite önbelleği (süreçler arası paylaşılabilir)"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT)")
+        self.conn.commit()
+
+    @staticmethod
+    def _key(text):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts):
+        keys = [self._key(t) for t in texts]
+        found = {}
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, text FROM translations WHERE key IN ({','.join('?' * len(batch))})", batch
+            )
+            found.update(rows)
+        return [found.get(k) for k in keys]
+
+    def put_many(self, pairs):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO translations (key, text) VALUES (?, ?)",
+            [(self._key(src), dst) for src, dst in pairs],
+        )
+        self.conn.commit()
+
+
+# --- WORKER ---
+def _init_worker(model_path, vectorizer_path, translate, cache_path):
+    """Her worker sürecinde bir kez çalışır: modeli yükler, BLAS thread'lerini 1'e indirir"""
+    from threadpoolctl import threadpool_limits
+
+    # Süreç havuzu zaten tüm çekirdekleri kullanıyor; iç içe paralellik aşırı abonelik yaratır
+    threadpool_limits(1)
+    _worker["model"] = joblib.load(model_path)
+    _worker["vectorizer"] = joblib.load(vectorizer_path)
+    _worker["lemmatizer"] = LemmaTable.load(LEMMA_TABLE_PATH)
+    _worker["classes"] = list(_worker["model"].classes_)
+    _worker["translate"] = translate
+    _worker["cache"] = TranslationCache(cache_path) if translate and cache_path else None
+
+
+def _translate_texts(texts):
+    cache = _worker["cache"]
+    budget = translation_budget()
+    cached = cache.get_many(texts) if cache else [None] * len(texts)
+    translated, fresh = [], []
+    for text, hit in zip(texts, cached):
+        if hit is not None:
+            translated.append(hit)
+            continue
+        # Uzun metinler parçalanıp paralel çevrilir; hatalı parçalar orijinal kalır
+        result, failed = translate_chunks(text, budget)
+        if not failed:
+            fresh.append((text, result))
+        translated.append(result)
+    if cache and fresh:
+        cache.put_many(fresh)
+    return translated
+
+
+def _score_chunk(texts):
+    """Bir parçayı skorlar: [(tahmin, güven, [(tür, olasılık) x5]), ...]"""
+    if _worker["translate"]:
+        texts = _translate_texts(texts)
+    model, classes = _worker["model"], _worker["classes"]
+    X = _worker["vectorizer"].transform([clean_text(t, _worker["lemmatizer"]) for t in texts])
+    proba = class_probabilities(model, X)
+    if proba is None:
+        return [(p, None, []) for p in model.predict(X)]
+    results = []
+    for row in proba:
+        # predict_proba olan modellerde predict() = argmax(proba); ikinci bir geçiş gerekmez
+        ranked = top_k(classes, row, TOP_K)
+        results.append((ranked[0][0], ranked[0][1], ranked))
+    return results
+
+
+# --- GİRDİ/ÇIKTI ---
+def _read_chunks(path, columns, chunk_size):
+    """Girdiyi `chunk_size` satırlık DataFrame parçaları halinde okur"""
+    if path.lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("❌ Parquet okumak için pyarrow gerekli: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size, on_bad_lines='skip')
+
+
+def iter_chunks(path, columns, chunk_size, skip_rows):
+    """
+    Girdiyi parçalar halinde okur, ilk `skip_rows` ayrıştırılmış satırı atlar.
+    Bozuk CSV satırları atlandığı için ham satır sayısıyla değil, ayrıştırılan
+    satırlar üzerinden sayılır; böylece --resume aynı satırı iki kez skorlamaz.
+    """
+    skipped = 0
+    for df in _read_chunks(path, columns, chunk_size):
+        if skipped + len(df) <= skip_rows:
+            skipped += len(df)
+            continue
+        df = df.iloc[max(0, skip_rows - skipped):]
+        skipped = skip_rows
+        yield df
+
+
+def output_header(id_column):
+    header = ["row"] + ([id_column] if id_column else []) + ["predicted_genre", "confidence"]
+    for i in range(1, TOP_K + 1):
+        header += [f"top{i}_genre", f"top{i}_probability"]
+    return header
+
+
+def output_rows(first_row, ids, results):
+    for offset, (prediction, confidence, ranked) in enumerate(results):
+        row = [first_row + offset] + ([ids[offset]] if ids is not None else [])
+        row += [prediction, "" if confidence is None else round(confidence, 6)]
+        for i in range(TOP_K):
+            row += [ranked[i][0], round(ranked[i][1], 6)] if i < len(ranked) else ["", ""]
+        yield row
+
+
+def load_progress(progress_path):
+    if not os.path.exists(progress_path):
+        return None
+    with open(progress_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_progress(progress_path, state):
+    # Önce geçici dosyaya yaz, sonra atomik olarak değiştir
+    tmp_path = progress_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, progress_path)
+
+
+# --- ANA AKIŞ ---
+def bulk_score(args):
+    progress_path = args.output + ".progress.json"
+    progress = load_progress(progress_path) if args.resume else None
+    rows_done = 0
+
+    if progress is not None:
+        if progress.get("input") != os.path.abspath(args.input):
+            raise SystemExit("❌ İlerleme dosyası başka bir girdiye ait; --resume olmadan çalıştırın.")
+        rows_done = progress["rows_done"]
+        out = open(args.output, "r+", newline="", encoding="utf-8")
+        # Son kayıttan sonra yarım yazılmış satırları at
+        out.truncate(progress["bytes_written"])
+        out.seek(progress["bytes_written"])
+        print(f"🔁 Kaldığı yerden devam: {rows_done} satır zaten skorlanmış.")
+    else:
+        out = open(args.output, "w", newline="", encoding="utf-8")
+        csv.writer(out).writerow(output_header(args.id_column))
+    writer = csv.writer(out)
+
+    columns = [args.text_column] + ([args.id_column] if args.id_column else [])
+    max_in_flight = max(1, args.workers * 2)
+    started = time.perf_counter()
+    scored = 0
+
+    def write_result(future, first_row, ids):
+        nonlocal rows_done, scored
+        results = future.result()
+        writer.writerows(output_rows(first_row, ids, results))
+        out.flush()
+        os.fsync(out.fileno())
+        rows_done = first_row + len(results)
+        scored += len(results)
+        save_progress(progress_path, {
+            "input": os.path.abspath(args.input),
+            "rows_done": rows_done,
+            "bytes_written": out.tell(),
+        })
+        rate = scored / (time.perf_counter() - started)
+        print(f"✅ {rows_done} satır skorlandı ({rate:.0f} satır/s)")
+
+    pending = deque()
+    next_row = rows_done
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.model, args.vectorizer, args.translate, args.translation_cache),
+    ) as pool:
+        for df in iter_chunks(args.input, columns, args.chunk_size, rows_done):
+            texts = df[args.text_column].fillna("").astype(str).tolist()
+            ids = df[args.id_column].tolist() if args.id_column else None
+            pending.append((pool.submit(_score_chunk, texts), next_row, ids))
+            next_row += len(texts)
+            # Sonuçlar girdi sırasıyla yazılır; kuyruk dolunca en eski parçayı bekle
+            while len(pending) >= max_in_flight:
+                write_result(*pending.popleft())
+        while pending:
+            write_result(*pending.popleft())
+
+    out.close()
+    elapsed = time.perf_counter() - started
+    print(f"\n🏁 Tamamlandı: {rows_done} satır, {elapsed:.1f}s -> {args.output}")
+    os.remove(progress_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CineAI Pro toplu tür tahmini")
+    parser.add_argument("input", help="Girdi CSV veya Parquet dosyası")
+    parser.add_argument("output", help="Tahminlerin yazılacağı CSV dosyası")
+    parser.add_argument("--text-column", default="plot", help="Özet metni sütunu")
+    parser.add_argument("--id-column", help="Çıktıya aynen kopyalanacak kimlik sütunu")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Parça başına satır sayısı")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Süreç sayısı")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--vectorizer", default=VECTORIZER_PATH)
+    parser.add_argument("--translate", action="store_true", help="Metinleri önce İngilizceye çevir")
+    parser.add_argument("--translation-cache", default="translation_cache.sqlite",
+                        help="Çeviri önbelleği (boş bırakılırsa kapalı)")
+    parser.add_argument("--resume", action="store_true", help="<output>.progress.json'dan devam et")
+    args = parser.parse_args()
+    bulk_score(args)
+
+
+if __name__ == "__main__":
+    main()
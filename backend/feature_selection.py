@@ -0,0 +1,95 @@
+"""
+CineAI Pro - Ortak Özellik Uzayı (TF-IDF + Özellik Seçimi)
+
+Eğitim betikleri vektörleştiriciyi ve (isteğe bağlı) özellik seçiciyi buradan kurar.
+Seçici paketteki vektörleştirici ile birlikte tek bir Pipeline olarak saklanır;
+servis tarafı `vectorizer.transform` çağırdığı için hiçbir değişiklik gerekmez.
+
+Ayarlar (eğitim sırasında okunur):
+    CINEAI_FEATURE_SELECTION : none | chi2 | mi | l1   (varsayılan: none)
+    CINEAI_FEATURE_K         : tutulacak özellik sayısı (varsayılan: 5000)
+    CINEAI_TFIDF_DTYPE       : float64 | float32        (varsayılan: float64)
+"""
+
+import os
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_selection import SelectFromModel, SelectKBest, chi2
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelBinarizer
+from sklearn.svm import LinearSVC
+
+FEATURE_SELECTION = os.environ.get("CINEAI_FEATURE_SELECTION", "none")
+FEATURE_K = int(os.environ.get("CINEAI_FEATURE_K", "5000"))
+TFIDF_DTYPE = os.environ.get("CINEAI_TFIDF_DTYPE", "float64")
+
+SELECTION_METHODS = ("none", "chi2", "mi", "l1")
+
+
+def make_tfidf(dtype=None):
+    """Her iki eğitim betiğinin kullandığı TF-IDF ayarları"""
+    return TfidfVectorizer(
+        max_features=10000, ngram_range=(1, 2), min_df=3, sublinear_tf=True,
+        dtype=np.dtype(dtype or TFIDF_DTYPE).type,
+    )
+
+
+def presence_mutual_info(X, y):
+    """
+    Kelimenin geçip geçmemesi (X > 0) ile sınıf arasındaki karşılıklı bilgi.
+    sklearn'ün mutual_info_classif'i seyrek TF-IDF'te her değeri ayrı kategori sayar
+    ve sütun sütun döner; burada tüm sütunlar tek matris çarpımıyla hesaplanır.
+    """
+    present = (X > 0).astype(np.float64)
+    Y = LabelBinarizer().fit_transform(y).astype(np.float64)
+    if Y.shape[1] == 1:
+        Y = np.hstack([1 - Y, Y])
+    n = X.shape[0]
+    # Ortak dağılım: [özellik, sınıf] için kelime var / yok sayıları
+    with_word = np.asarray(present.T @ Y)
+    class_counts = Y.sum(axis=0)
+    without_word = class_counts - with_word
+    word_counts = with_word.sum(axis=1, keepdims=True)
+
+    mi = np.zeros(X.shape[1])
+    for joint, marginal in ((with_word, word_counts), (without_word, n - word_counts)):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = joint / n * np.log(joint * n / (marginal * class_counts))
+        mi += np.nan_to_num(terms).sum(axis=1)
+    return mi
+
+
+def make_selector(method=None, k=None):
+    """Yapılandırılmış özellik seçiciyi döndürür; seçim kapalıysa None"""
+    method = method or FEATURE_SELECTION
+    k = k or FEATURE_K
+    if method not in SELECTION_METHODS:
+        raise ValueError(f"Bilinmeyen özellik seçimi: {method} (seçenekler: {', '.join(SELECTION_METHODS)})")
+    if method == "none":
+        return None
+    if method == "chi2":
+        return SelectKBest(chi2, k=k)
+    if method == "mi":
+        return SelectKBest(presence_mutual_info, k=k)
+    # L1 cezalı doğrusal model: katsayısı en büyük k özellik
+    l1 = LinearSVC(penalty="l1", dual=False, C=0.5, class_weight="balanced", max_iter=2000)
+    return SelectFromModel(l1, max_features=k, threshold=-np.inf)
+
+
+def with_selection(model, selector):
+    """
+    CV için model + seçici. cross_val_score her katmanda klonlayıp yeniden eğittiği için
+    seçim yalnızca o katmanın eğitim kısmı üzerinden yapılır (test katmanına sızmaz).
+    """
+    if selector is None:
+        return model
+    return Pipeline([("select", clone(selector)), ("model", model)])
+
+
+def package_vectorizer(tfidf, selector):
+    """Pakete yazılacak vektörleştirici: eğitilmiş TF-IDF (+ eğitilmiş seçici)"""
+    if selector is None:
+        return tfidf
+    return Pipeline([("tfidf", tfidf), ("select", selector)])
@@ -0,0 +1,38 @@
+"""
+CineAI Pro - Ortak Tahmin Yardımcıları
+API (main.py) ve toplu skorlama (bulk_score.py) aynı temizleme ve olasılık yolunu kullanır.
+"""
+
+import numpy as np
+
+from text_normalization import normalize
+
+
+def clean_text(text: str, lemmatizer) -> str:
+    """
+    Metni eğitimdeki clean_text_english ile aynı şekilde temizle (ortak normalize).
+    `lemmatizer`, modelle aynı eğitim çalıştırmasından gelen LemmaTable'dır (ModelBundle.lemmatizer).
+    """
+    return normalize(text, lemmatizer)
+
+
+def class_probabilities(model, X):
+    """
+    Sınıf olasılık matrisi (n_samples x n_classes).
+    predict_proba yoksa decision_function'a softmax uygulanır; ikisi de yoksa None.
+    """
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(X)
+    if hasattr(model, 'decision_function'):
+        # SVM gibi modeller için decision function kullan
+        decision = model.decision_function(X)
+        # Softmax uygula
+        exp_decision = np.exp(decision - np.max(decision, axis=1, keepdims=True))
+        return exp_decision / exp_decision.sum(axis=1, keepdims=True)
+    return None
+
+
+def top_k(classes, proba_row, k=5):
+    """Bir satırın en olası k sınıfı: [(sınıf, olasılık), ...]"""
+    order = np.argsort(-proba_row, kind="stable")[:k]
+    return [(classes[i], float(proba_row[i])) for i in order]
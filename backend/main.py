@@ -3,20 +3,82 @@ CineAI Pro - Film Türü Tahmin API
 FastAPI Backend Servisi
 """
 
-from fastapi import FastAPI, HTTPException
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import hmac
+import os
+from contextlib import asynccontextmanager, nullcontext
+
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-import joblib
-import numpy as np
-import re
-import os
-from deep_translator import GoogleTranslator
+from admission import AdmissionController, Deadline, DeadlineExceeded, Overloaded, parse_degraded_modes
+from inference import class_probabilities, clean_text, top_k
+from metrics import (DEGRADED_REQUESTS, PREDICT_INPUT_CHARS, PREDICT_REJECTED, PREDICT_REQUESTS,
+                     PREDICT_STAGE_SECONDS, SlowRequestProfiler, render_metrics, stage_timer)
+from model_store import ModelStore, artifact_mtimes
+from translation import translate_to_english, warmup as warmup_translation
+
+# Admin reload anahtarı (boşsa /admin/reload kapalıdır)
+ADMIN_TOKEN = os.environ.get("CINEAI_ADMIN_TOKEN", "")
+# Model dosyalarını izleme aralığı (saniye, 0 = kapalı)
+MODEL_WATCH_INTERVAL = float(os.environ.get("CINEAI_MODEL_WATCH_INTERVAL", "0"))
+# Bu süreyi (ms) aşan tahmin isteklerinden stack örneği topla (0 = kapalı)
+SLOW_REQUEST_MS = float(os.environ.get("CINEAI_SLOW_REQUEST_MS", "0"))
+
+# /predict/batch için tek istekteki en fazla metin sayısı
+MAX_BATCH_SIZE = int(os.environ.get("CINEAI_MAX_BATCH_SIZE", "64"))
+
+# Aynı anda işlenen en fazla tahmin isteği ve slot bekleyebilecek en fazla istek (dolunca 429)
+MAX_IN_FLIGHT = int(os.environ.get("CINEAI_MAX_IN_FLIGHT", "8"))
+MAX_QUEUE = int(os.environ.get("CINEAI_MAX_QUEUE", "32"))
+# İstek başına süre sınırı (ms, 0 = sınırsız); sırada bekleme dahildir, aşılınca 503
+REQUEST_DEADLINE_MS = float(os.environ.get("CINEAI_REQUEST_DEADLINE_MS", "10000"))
+# 429/503 yanıtlarındaki Retry-After (saniye)
+RETRY_AFTER_SECONDS = int(os.environ.get("CINEAI_RETRY_AFTER_SECONDS", "1"))
+# Yük altında uygulanacak modlar: "off" veya "skip_translation", "cheap_model" (virgülle birlikte)
+DEGRADED_MODES = parse_degraded_modes(os.environ.get("CINEAI_DEGRADED_MODE", "off"))
+# Sıradaki istek sayısı bu değere ulaşınca yeni istekler degraded modda işlenir
+DEGRADE_QUEUE_DEPTH = int(os.environ.get("CINEAI_DEGRADE_QUEUE_DEPTH", str(MAX_QUEUE // 2)))
+
+profiler = SlowRequestProfiler(SLOW_REQUEST_MS / 1000) if SLOW_REQUEST_MS > 0 else None
+admission = AdmissionController(MAX_IN_FLIGHT, MAX_QUEUE, DEGRADED_MODES, DEGRADE_QUEUE_DEPTH)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Başlangıçta modeli yükle/ısıt, istenirse dosya izleyicisini başlat"""
+    failed_mtimes = None
+    mtimes = artifact_mtimes()
+    try:
+        store.reload()
+        print("✅ Model ve Vectorizer başarıyla yüklendi!")
+    except Exception as e:
+        failed_mtimes = mtimes
+        print(f"❌ Model yükleme hatası: {e}")
+    warmup_translation()
+    store.startup_seconds = time.perf_counter() - _IMPORT_STARTED
+    if profiler is not None:
+        profiler.start()
+
+    watcher = None
+    if MODEL_WATCH_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_model_files(MODEL_WATCH_INTERVAL, failed_mtimes))
+    yield
+    if watcher is not None:
+        watcher.cancel()
+
 
 # FastAPI uygulaması oluştur
 app = FastAPI(
     title="CineAI Pro API",
     description="Film türü tahmin servisi - Türkçe açıklamadan tür tahmini yapar",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS ayarları - Frontend'den gelen isteklere izin ver
@@ -28,20 +90,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Model ve Vectorizer yolları
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_PATH = os.path.join(BASE_DIR, "models", "final_best_model.pkl")
-VECTORIZER_PATH = os.path.join(BASE_DIR, "models", "final_vectorizer.pkl")
-
-# Model ve Vectorizer'ı yükle
-try:
-    model = joblib.load(MODEL_PATH)
-    vectorizer = joblib.load(VECTORIZER_PATH)
-    print("✅ Model ve Vectorizer başarıyla yüklendi!")
-except Exception as e:
-    print(f"❌ Model yükleme hatası: {e}")
-    model = None
-    vectorizer = None
+
+@app.middleware("http")
+async def record_predict_metrics(request: Request, call_next):
+    """Tahmin isteklerinin toplam süresini ve durum kodunu kaydet"""
+    if not request.url.path.startswith("/predict"):
+        return await call_next(request)
+    started = time.perf_counter()
+    response = await call_next(request)
+    PREDICT_STAGE_SECONDS.observe(time.perf_counter() - started, "total")
+    PREDICT_REQUESTS.inc(str(response.status_code))
+    return response
 
 # Tekil tür bilgileri - Emoji ve açıklamalar (küçük harf key)
 GENRE_INFO_SINGLE = {
@@ -126,6 +185,38 @@ def get_genre_info(genre_key: str) -> dict:
                 "description": "Film türü"
             }
 
+
+# Aktif model bundle'ı (reload ile atomik olarak değişir)
+store = ModelStore(get_genre_info)
+
+
+async def watch_model_files(interval: float, failed=None):
+    """
+    Model dosyalarını periyodik olarak kontrol eder.
+    Değişiklik iki ardışık kontrolde aynı kalınca (yazım bitince) arka planda reload yapar.
+    Yüklenemeyen dosya sürümleri (`failed`: başlangıçta ya da izleyicide başarısız
+    olan mtime'lar) dosyalar yeniden değişene kadar tekrar denenmez.
+    """
+    pending = None
+    while True:
+        await asyncio.sleep(interval)
+        current = artifact_mtimes()
+        bundle = store.bundle
+        if current is None or current == failed or (bundle is not None and current == bundle.mtimes):
+            pending = None
+            continue
+        if current != pending:
+            pending = current
+            continue
+        try:
+            await asyncio.to_thread(store.reload)
+            failed = None
+            print("🔄 Model dosyaları değişti, yeni model yüklendi.")
+        except Exception as e:
+            failed = current
+            print(f"❌ Model yeniden yükleme hatası: {e}")
+        pending = None
+
 # Request ve Response modelleri
 class PredictRequest(BaseModel):
     text: str
@@ -146,26 +237,15 @@ class PredictResponse(BaseModel):
     top_5_probabilities: list[ProbabilityItem]
     translated_text: str
     original_text: str
+    degraded: list[str] = []
 
 
-def clean_text(text: str) -> str:
-    """Metni temizle - lowercase ve noktalama işaretlerini kaldır"""
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+class PredictBatchRequest(BaseModel):
+    texts: list[str]
 
-
-def translate_to_english(text: str) -> str:
-    """Türkçe metni İngilizceye çevir"""
-    try:
-        translator = GoogleTranslator(source='tr', target='en')
-        translated = translator.translate(text)
-        return translated
-    except Exception as e:
-        print(f"Çeviri hatası: {e}")
-        # Çeviri başarısız olursa orijinal metni döndür
-        return text
+class PredictBatchResponse(BaseModel):
+    success: bool
+    results: list[PredictResponse]
 
 
 @app.get("/")
@@ -174,99 +254,137 @@ async def root():
     return {
         "message": "🎬 CineAI Pro API'ye Hoş Geldiniz!",
         "status": "active",
-        "model_loaded": model is not None,
-        "vectorizer_loaded": vectorizer is not None,
+        "model_loaded": store.bundle is not None,
+        "vectorizer_loaded": store.bundle is not None,
         "endpoints": {
             "predict": "/predict (POST)",
-            "health": "/health (GET)"
+            "predict_batch": "/predict/batch (POST)",
+            "health": "/health (GET)",
+            "reload": "/admin/reload (POST)"
         }
     }
 
 
 @app.get("/health")
 async def health_check():
-    """Sağlık kontrolü endpoint'i"""
-    return {
-        "status": "healthy",
-        "model_loaded": model is not None,
-        "vectorizer_loaded": vectorizer is not None
-    }
+    """Sağlık kontrolü endpoint'i - başlangıç ve ilk istek gecikmesi dahil"""
+    return {"status": "healthy", **store.status(), "admission": admission.status()}
 
 
-@app.post("/predict", response_model=PredictResponse)
-async def predict_genre(request: PredictRequest):
-    """
-    Film türü tahmini yap
-    
-    1. Türkçe metni İngilizceye çevir
-    2. Metni temizle
-    3. Vektörleştir
-    4. Model ile tahmin yap
-    5. Sonuçları döndür
-    """
-    
-    # Model kontrolü
-    if model is None or vectorizer is None:
+@app.post("/admin/reload")
+async def reload_model(x_admin_token: str = Header(default="")):
+    """Yeni model artefaktlarını arka planda yükle, ısıt ve atomik olarak devreye al"""
+    if not ADMIN_TOKEN or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Yetkisiz reload isteği.")
+    try:
+        await asyncio.to_thread(store.reload)
+    except Exception as e:
         raise HTTPException(
-            status_code=500, 
-            detail="Model veya Vectorizer yüklenemedi. Lütfen dosyaların varlığını kontrol edin."
+            status_code=500,
+            detail=f"Model yeniden yüklenemedi, eski model kullanılmaya devam ediyor: {str(e)}"
         )
-    
-    # Boş metin kontrolü
-    if not request.text or len(request.text.strip()) < 10:
+    return {"success": True, **store.status()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Tahmin hattı metrikleri (Prometheus metin formatı)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/slow-requests")
+async def slow_requests():
+    """Eşiği aşan son isteklerin stack örnekleri (CINEAI_SLOW_REQUEST_MS ile açılır)"""
+    if profiler is None:
+        return {"enabled": False, "reports": []}
+    return {
+        "enabled": True,
+        "threshold_ms": SLOW_REQUEST_MS,
+        "reports": list(profiler.reports)
+    }
+
+
+def _validate_text(text: str):
+    """Boş veya çok kısa metinleri reddet"""
+    if not text or len(text.strip()) < 10:
         raise HTTPException(
             status_code=400,
             detail="Lütfen en az 10 karakterlik bir film açıklaması girin."
         )
-    
-    try:
-        original_text = request.text.strip()
-        
-        # 1. Türkçe metni İngilizceye çevir
-        translated_text = translate_to_english(original_text)
-        
-        # 2. Metni temizle
-        cleaned_text = clean_text(translated_text)
-        
-        # 3. Vektörleştir
-        text_vectorized = vectorizer.transform([cleaned_text])
-        
-        # 4. Tahmin yap
-        prediction = model.predict(text_vectorized)[0]
-        
-        # 5. Olasılıkları al (eğer model destekliyorsa)
+
+
+def _predict_texts(bundle, original_texts: list[str], deadline=None,
+                   degraded=frozenset()) -> list[PredictResponse]:
+    """
+    Metinleri çevirir, temizler ve tek bir vektörleştirme + tahmin çağrısıyla skorlar.
+    Tekil ve batch endpoint'ler aynı yolu kullanır. `deadline` her aşamadan önce
+    kontrol edilir; `degraded` yük altında atlanacak/ucuzlatılacak adımlardır.
+    """
+    deadline = deadline or Deadline(0)
+    for text in original_texts:
+        PREDICT_INPUT_CHARS.observe(len(text))
+
+    # Yedek model yüklü değilse "cheap_model" uygulanamaz; yanıtta ve metrikte yer almaz
+    applied = set(degraded)
+    if bundle.fallback_model is None:
+        applied.discard("cheap_model")
+
+    # 1. Türkçe metni İngilizceye çevir (yük altında atlanabilir)
+    deadline.check("translate")
+    with stage_timer("translate"):
+        if "skip_translation" in applied:
+            DEGRADED_REQUESTS.inc("skip_translation")
+            translated_texts = list(original_texts)
+        else:
+            translated_texts = [translate_to_english(text, deadline) for text in original_texts]
+
+    # 2. Metni temizle
+    deadline.check("clean_text")
+    with stage_timer("clean_text"):
+        cleaned_texts = [clean_text(text, bundle.lemmatizer) for text in translated_texts]
+
+    # 3. Vektörleştir
+    model, classes = bundle.model, bundle.classes
+    if "cheap_model" in applied:
+        DEGRADED_REQUESTS.inc("cheap_model")
+        model, classes = bundle.fallback_model, list(bundle.fallback_model.classes_)
+    deadline.check("vectorize")
+    with stage_timer("vectorize"):
+        text_vectorized = bundle.vectorizer.transform(cleaned_texts)
+
+    # 4. Tahmin yap
+    deadline.check("predict")
+    with stage_timer("predict"):
+        predictions = model.predict(text_vectorized)
+
+    # 5. Olasılıkları al (eğer model destekliyorsa)
+    with stage_timer("predict_proba"):
+        proba = class_probabilities(model, text_vectorized)
+
+    responses = []
+    for i, prediction in enumerate(predictions):
         probabilities = {}
-        if hasattr(model, 'predict_proba'):
-            proba = model.predict_proba(text_vectorized)[0]
-            classes = model.classes_
-            probabilities = {cls: float(prob) for cls, prob in zip(classes, proba)}
-        elif hasattr(model, 'decision_function'):
-            # SVM gibi modeller için decision function kullan
-            decision = model.decision_function(text_vectorized)[0]
-            classes = model.classes_
-            # Softmax uygula
-            exp_decision = np.exp(decision - np.max(decision))
-            proba = exp_decision / exp_decision.sum()
-            probabilities = {cls: float(prob) for cls, prob in zip(classes, proba)}
-        
-        # İlk 5 olasılığı al
-        sorted_probs = sorted(probabilities.items(), key=lambda x: x[1], reverse=True)[:5]
-        
+        sorted_probs = []
+        if proba is not None:
+            probabilities = {cls: float(prob) for cls, prob in zip(classes, proba[i])}
+            # İlk 5 olasılığı al
+            sorted_probs = top_k(classes, proba[i], 5)
+
         top_5 = []
         for genre, prob in sorted_probs:
-            genre_data = get_genre_info(genre)
+            genre_data = bundle.class_info.get(genre) or get_genre_info(genre)
             top_5.append(ProbabilityItem(
                 genre=genre,
                 genre_tr=genre_data["tr"],
                 emoji=genre_data["emoji"],
                 probability=round(prob * 100, 2)
             ))
-        
+
         # Tahmin edilen türün bilgileri
-        predicted_info = get_genre_info(prediction)
+        predicted_info = bundle.class_info.get(prediction) or get_genre_info(prediction)
         confidence = probabilities.get(prediction, 0) * 100
-        
-        return PredictResponse(
+
+        responses.append(PredictResponse(
             success=True,
             predicted_genre=prediction,
             predicted_genre_tr=predicted_info["tr"],
@@ -274,10 +392,102 @@ async def predict_genre(request: PredictRequest):
             description=predicted_info["description"],
             confidence=round(confidence, 2),
             top_5_probabilities=top_5,
-            translated_text=translated_text,
-            original_text=original_text
+            translated_text=translated_texts[i],
+            original_text=original_texts[i],
+            degraded=sorted(applied)
+        ))
+    return responses
+
+
+def _require_bundle():
+    """Aktif bundle'ı döndür - istek boyunca aynı bundle kullanılır"""
+    bundle = store.bundle
+    if bundle is None:
+        raise HTTPException(
+            status_code=500, 
+            detail="Model veya Vectorizer yüklenemedi. Lütfen dosyaların varlığını kontrol edin."
         )
-        
+    return bundle
+
+
+async def _admit(name: str, bundle, texts: list[str]) -> list[PredictResponse]:
+    """
+    Tahmini kabul kontrolünden geçirip bir worker thread'inde çalıştırır.
+    Sıra doluysa 429, süre dolarsa 503 döner (ikisinde de Retry-After ile).
+    """
+    deadline = Deadline(REQUEST_DEADLINE_MS / 1000)
+
+    def job(deadline, degraded):
+        with profiler.track(name) if profiler is not None else nullcontext():
+            return _predict_texts(bundle, texts, deadline, degraded)
+
+    retry_after = {"Retry-After": str(RETRY_AFTER_SECONDS)}
+    try:
+        return await admission.run(job, deadline)
+    except Overloaded:
+        PREDICT_REJECTED.inc("queue_full")
+        raise HTTPException(
+            status_code=429,
+            detail="Sunucu şu anda çok yoğun, lütfen biraz sonra tekrar deneyin.",
+            headers=retry_after
+        )
+    except DeadlineExceeded as e:
+        PREDICT_REJECTED.inc(f"deadline_{e}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Tahmin {REQUEST_DEADLINE_MS:.0f} ms süre sınırında tamamlanamadı ({e} aşaması).",
+            headers=retry_after
+        )
+
+
+@app.post("/predict", response_model=PredictResponse)
+async def predict_genre(request: PredictRequest):
+    """
+    Film türü tahmini yap
+    
+    1. Türkçe metni İngilizceye çevir
+    2. Metni temizle
+    3. Vektörleştir
+    4. Model ile tahmin yap
+    5. Sonuçları döndür
+    """
+    
+    started = time.perf_counter()
+    bundle = _require_bundle()
+    _validate_text(request.text)
+    
+    try:
+        response = (await _admit("predict", bundle, [request.text.strip()]))[0]
+        store.record_first_request(time.perf_counter() - started)
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Tahmin sırasında bir hata oluştu: {str(e)}"
+        )
+
+
+@app.post("/predict/batch", response_model=PredictBatchResponse)
+async def predict_genre_batch(request: PredictBatchRequest):
+    """Birden fazla açıklama için tek vektörleştirme/tahmin çağrısıyla tür tahmini yap"""
+    bundle = _require_bundle()
+    if not request.texts or len(request.texts) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch 1 ile {MAX_BATCH_SIZE} arasında metin içermelidir."
+        )
+    for text in request.texts:
+        _validate_text(text)
+
+    try:
+        results = await _admit("predict_batch", bundle, [text.strip() for text in request.texts])
+        return PredictBatchResponse(success=True, results=results)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
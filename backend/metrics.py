@@ -0,0 +1,243 @@
+"""
+CineAI Pro - Metrikler
+Tahmin hattı için düşük maliyetli sayaçlar/histogramlar (Prometheus metin formatı)
+ve yavaş istekler için isteğe bağlı örnekleyici profiler.
+"""
+
+import itertools
+import sys
+import threading
+import time
+from collections import Counter as _StackCounter
+from collections import deque
+from contextlib import contextmanager
+
+# Saniye cinsinden gecikme kovaları (çeviri ağ çağrısı olduğu için üst uç geniş)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Karakter cinsinden girdi uzunluğu kovaları
+LENGTH_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 200000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Counter:
+    """Yalnızca artan sayaç (etiketli veya etiketsiz)"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1.0):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Sabit kovalı histogram (etiketli veya etiketsiz)"""
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        # Kova araması kilit dışında yapılır; kilit yalnızca birkaç toplama için tutulur
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        for labelvalues, (counts, total, count) in items:
+            for bound, cumulative in zip(self.buckets, itertools.accumulate(counts)):
+                labels = _format_labels(self.labelnames, labelvalues, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge:
+    """Anlık değer (etiketsiz); son `set` edilen değeri raporlar"""
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self._value = 0.0
+
+    def set(self, value):
+        self._value = float(value)
+
+    def render(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge",
+                f"{self.name} {_format_value(self._value)}"]
+
+
+# --- TAHMİN HATTI METRİKLERİ ---
+PREDICT_STAGE_SECONDS = Histogram(
+    "cineai_predict_stage_seconds",
+    "Tahmin hattındaki her aşamanın süresi (saniye).",
+    LATENCY_BUCKETS,
+    labelnames=("stage",),
+)
+PREDICT_INPUT_CHARS = Histogram(
+    "cineai_predict_input_chars",
+    "Tahmin isteklerindeki girdi metninin uzunluğu (karakter).",
+    LENGTH_BUCKETS,
+)
+PREDICT_REQUESTS = Counter(
+    "cineai_predict_requests_total",
+    "HTTP durum koduna göre tahmin istekleri.",
+    labelnames=("status",),
+)
+TRANSLATION_FAILURES = Counter(
+    "cineai_translation_failures_total",
+    "Orijinal metne geri düşülen çeviri hataları.",
+)
+
+PREDICT_IN_FLIGHT = Gauge(
+    "cineai_predict_in_flight",
+    "Şu anda worker thread'lerinde işlenen tahmin işi sayısı.",
+)
+PREDICT_QUEUED = Gauge(
+    "cineai_predict_queued",
+    "Boş slot bekleyen tahmin isteği sayısı.",
+)
+PREDICT_REJECTED = Counter(
+    "cineai_predict_rejected_total",
+    "Reddedilen tahmin istekleri (queue_full veya süresinin dolduğu aşama).",
+    labelnames=("reason",),
+)
+DEGRADED_REQUESTS = Counter(
+    "cineai_predict_degraded_total",
+    "Yük altında degraded modda işlenen tahmin istekleri.",
+    labelnames=("mode",),
+)
+
+REGISTRY = [PREDICT_STAGE_SECONDS, PREDICT_INPUT_CHARS, PREDICT_REQUESTS, TRANSLATION_FAILURES,
+            PREDICT_IN_FLIGHT, PREDICT_QUEUED, PREDICT_REJECTED, DEGRADED_REQUESTS]
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Bloğun süresini `cineai_predict_stage_seconds{stage=...}` histogramına yazar"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PREDICT_STAGE_SECONDS.observe(time.perf_counter() - started, stage)
+
+
+def render_metrics() -> str:
+    """Tüm metrikleri Prometheus metin formatında döndürür"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- YAVAŞ İSTEK PROFİLER'I ---
+class SlowRequestProfiler:
+    """
+    Eşik süresini aşan isteklerin thread'ini periyodik olarak örnekler.
+    Örnekleme yalnızca eşiği geçmiş aktif istek varken yapılır; hızlı istekler
+    yalnızca bir sözlük ekleme/silme maliyeti öder.
+    """
+
+    def __init__(self, threshold_seconds: float, interval_seconds: float = 0.005, keep_last: int = 20):
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = interval_seconds
+        self.reports = deque(maxlen=keep_last)
+        self._active = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="slow-request-sampler", daemon=True)
+            self._thread.start()
+
+    @contextmanager
+    def track(self, name: str):
+        """Bloğu çalıştıran thread'i, eşik aşılırsa örneklenmek üzere kaydeder"""
+        request_id = next(self._ids)
+        entry = {"thread_id": threading.get_ident(), "started": time.perf_counter(), "stacks": _StackCounter()}
+        with self._lock:
+            self._active[request_id] = entry
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active.pop(request_id, None)
+            duration = time.perf_counter() - entry["started"]
+            if duration >= self.threshold_seconds and entry["stacks"]:
+                report = {
+                    "name": name,
+                    "duration_seconds": round(duration, 4),
+                    "samples": sum(entry["stacks"].values()),
+                    "stacks": [{"stack": s, "count": c} for s, c in entry["stacks"].most_common(10)],
+                }
+                self.reports.append(report)
+                print(f"🐢 Yavaş istek ({name}): {duration * 1000:.1f} ms, {report['samples']} örnek")
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval_seconds)
+            now = time.perf_counter()
+            with self._lock:
+                slow = [e for e in self._active.values() if now - e["started"] >= self.threshold_seconds]
+            if not slow:
+                continue
+            frames = sys._current_frames()
+            for entry in slow:
+                frame = frames.get(entry["thread_id"])
+                if frame is not None:
+                    entry["stacks"][_collapse_stack(frame)] += 1
+
+
+def _collapse_stack(frame) -> str:
+    """Frame zincirini flamegraph uyumlu 'dosya:fonksiyon;...' biçimine çevirir"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
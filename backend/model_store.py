@@ -0,0 +1,172 @@
+"""
+CineAI Pro - Model Deposu
+Model ve Vectorizer'ı arka planda yükler, ısıtır ve atomik olarak değiştirir.
+"""
+
+import os
+import threading
+import time
+
+import joblib
+
+from text_normalization import LEMMA_TABLE_PATH, LemmaTable
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.environ.get(
+    "CINEAI_MODEL_PATH", os.path.join(BASE_DIR, "models", "final_best_model.pkl")
+)
+VECTORIZER_PATH = os.environ.get(
+    "CINEAI_VECTORIZER_PATH", os.path.join(BASE_DIR, "models", "final_vectorizer.pkl")
+)
+# Yük altında "cheap_model" degraded modunda kullanılan ucuz model (varsa; aynı vectorizer ile)
+FALLBACK_MODEL_PATH = os.environ.get(
+    "CINEAI_FALLBACK_MODEL_PATH", os.path.join(BASE_DIR, "models", "final_fallback_model.pkl")
+)
+
+# Isıtma için sentetik (temizlenmiş) İngilizce özetler - her sınıfa yakın birer örnek
+WARMUP_TEXTS = [
+    "soldier lead daring rescue mission enemy territory explosion chase",
+    "clumsy father family vacation go hilariously wrong funny dog",
+    "detective investigate brutal murder small town dark secret killer",
+    "young woman fall love struggle family loss emotional journey",
+    "crew spaceship discover alien planet future technology magic",
+]
+
+
+class ModelBundle:
+    """Birlikte yüklenen model, vectorizer ve önceden hesaplanmış sınıf bilgileri"""
+
+    def __init__(self, model, vectorizer, lemmatizer, class_info, mtimes, load_seconds, warmup_seconds,
+                 fallback_model=None):
+        self.model = model
+        self.vectorizer = vectorizer
+        # Servis özellikleri eğitimdeki lemmalara bağlı: tablo modelle birlikte değişir
+        self.lemmatizer = lemmatizer
+        self.classes = list(model.classes_)
+        self.fallback_model = fallback_model
+        self.class_info = class_info
+        self.mtimes = mtimes
+        self.load_seconds = load_seconds
+        self.warmup_seconds = warmup_seconds
+        self.loaded_at = time.time()
+
+
+def _optional_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def artifact_mtimes():
+    """
+    Model, vectorizer, lemma tablosu ve ucuz modelin değişim zamanları.
+    Model veya vectorizer yoksa None; diğerleri isteğe bağlıdır (yoksa kendi değeri None),
+    böylece ucuz modelin yazılması ya da silinmesi de reload tetikler.
+    """
+    try:
+        required = (os.path.getmtime(MODEL_PATH), os.path.getmtime(VECTORIZER_PATH))
+    except OSError:
+        return None
+    return required + (_optional_mtime(LEMMA_TABLE_PATH), _optional_mtime(FALLBACK_MODEL_PATH))
+
+
+def load_fallback(X_warm):
+    """
+    İsteğe bağlı ucuz modeli yükler ve ısıtır. Dosya yoksa ya da yüklenen vectorizer ile
+    uyuşmuyorsa (ör. farklı sözlük boyutu) None döner; ana modelin yüklenmesini asla engellemez.
+    """
+    if not os.path.exists(FALLBACK_MODEL_PATH):
+        return None
+    try:
+        fallback_model = joblib.load(FALLBACK_MODEL_PATH)
+        fallback_model.predict_proba(X_warm)
+        return fallback_model
+    except Exception as e:
+        print(f"⚠️ Ucuz model kullanılamıyor ({FALLBACK_MODEL_PATH}), cheap_model devre dışı: {e}")
+        return None
+
+
+def load_bundle(genre_info_fn) -> ModelBundle:
+    """
+    Artefaktları diskten yükler ve sentetik bir batch ile ısıtır.
+    Isıtma sırasında hata çıkarsa bundle hiç yayınlanmaz.
+    """
+    mtimes = artifact_mtimes()
+
+    started = time.perf_counter()
+    model = joblib.load(MODEL_PATH)
+    vectorizer = joblib.load(VECTORIZER_PATH)
+    lemmatizer = LemmaTable.load(LEMMA_TABLE_PATH)
+    load_seconds = time.perf_counter() - started
+
+    # sklearn'ün ilk çağrı maliyetlerini (doğrulama, BLAS, tree cache) burada öde
+    started = time.perf_counter()
+    X_warm = vectorizer.transform(WARMUP_TEXTS)
+    model.predict(X_warm)
+    if hasattr(model, "predict_proba"):
+        model.predict_proba(X_warm)
+    elif hasattr(model, "decision_function"):
+        model.decision_function(X_warm)
+    fallback_model = load_fallback(X_warm)
+    class_info = {cls: genre_info_fn(cls) for cls in model.classes_}
+    warmup_seconds = time.perf_counter() - started
+
+    return ModelBundle(model, vectorizer, lemmatizer, class_info, mtimes, load_seconds, warmup_seconds,
+                       fallback_model)
+
+
+class ModelStore:
+    """
+    Aktif ModelBundle'ı tutar.
+    İstekler başta `store.bundle` referansını bir kez alır; reload yeni bir bundle
+    oluşturup referansı tek atamayla değiştirir, böylece devam eden istekler eski
+    bundle ile güvenle tamamlanır.
+    """
+
+    def __init__(self, genre_info_fn):
+        self._genre_info_fn = genre_info_fn
+        self._bundle = None
+        self._reload_lock = threading.Lock()
+        self.reload_count = 0
+        self.last_error = None
+        self.startup_seconds = None
+        self.first_request_seconds = None
+
+    @property
+    def bundle(self):
+        return self._bundle
+
+    def reload(self) -> ModelBundle:
+        """Yeni artefaktları yükle, ısıt ve yayınla. Hata olursa eski bundle kalır."""
+        with self._reload_lock:
+            try:
+                new_bundle = load_bundle(self._genre_info_fn)
+            except Exception as e:
+                self.last_error = str(e)
+                raise
+            self._bundle = new_bundle
+            self.reload_count += 1
+            self.last_error = None
+            return new_bundle
+
+    def record_first_request(self, seconds: float):
+        if self.first_request_seconds is None:
+            self.first_request_seconds = seconds
+
+    def status(self) -> dict:
+        bundle = self._bundle
+        return {
+            "model_loaded": bundle is not None,
+            "vectorizer_loaded": bundle is not None,
+            "fallback_model_loaded": bundle is not None and bundle.fallback_model is not None,
+            "loaded_at": bundle.loaded_at if bundle else None,
+            "load_seconds": round(bundle.load_seconds, 4) if bundle else None,
+            "warmup_seconds": round(bundle.warmup_seconds, 4) if bundle else None,
+            "reload_count": self.reload_count,
+            "last_reload_error": self.last_error,
+            "startup_seconds": round(self.startup_seconds, 4) if self.startup_seconds is not None else None,
+            "first_request_seconds": (
+                round(self.first_request_seconds, 4) if self.first_request_seconds is not None else None
+            ),
+        }
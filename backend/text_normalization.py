@@ -0,0 +1,164 @@
+"""
+CineAI Pro - Ortak Metin Normalizasyonu
+
+Eğitim (processing_and_training/data_preprocessing.py) ve servis (inference.py)
+aynı `normalize` fonksiyonunu kullanır:
+    MAX_TEXT_CHARS'a kısalt -> lowercase -> noktalama ve rakamları sil
+    -> stopword'leri at -> WordNet (isim) lemması
+
+Servis tarafı NLTK import etmez: stopword listesi burada sabittir, lemmalar
+eğitim sırasında üretilen models/lemma_table.json tablosundan okunur.
+
+Tabloyu mevcut işlenmiş CSV'lerden (NLTK olmadan) yeniden üretmek için:
+    python text_normalization.py build-table
+"""
+
+import json
+import os
+import re
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Özellik çıkarılacak en fazla İngilizce karakter (eğitim ve servis aynı sınırı kullanır)
+MAX_TEXT_CHARS = int(os.environ.get("CINEAI_MAX_TEXT_CHARS", "2500"))
+LEMMA_TABLE_PATH = os.environ.get(
+    "CINEAI_LEMMA_TABLE_PATH", os.path.join(BASE_DIR, "models", "lemma_table.json")
+)
+
+# nltk.corpus.stopwords.words('english') - eğitim verisi bu 179 kelimelik liste ile üretildi
+STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+yourselves he him his himself she she's her hers herself it it's its itself they them their
+theirs themselves what which who whom this that that'll these those am is are was were be
+been being have has had having do does did doing a an the and but if or because as until
+while of at by for with about against between into through during before after above below
+to from up down in out on off over under again further then once here there when where why
+how all any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren aren't
+couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't
+ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn wasn't
+weren weren't won won't wouldn wouldn't
+""".split())
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_DIGITS = re.compile(r'\d+')
+
+# WordNet'in isimlere uyguladığı çekim eki kuralları (nltk WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS)
+_NOUN_SUFFIXES = (
+    ("s", ""), ("ses", "s"), ("xes", "x"), ("zes", "z"),
+    ("ches", "ch"), ("shes", "sh"), ("men", "man"), ("ies", "y"),
+)
+
+
+def normalize(text, lemmatize) -> str:
+    """Eğitim ve servis için tek temizleme yolu"""
+    text = str(text)[:MAX_TEXT_CHARS].lower()
+    text = _NON_WORD.sub('', text)
+    text = _DIGITS.sub('', text)
+    return " ".join([lemmatize(w) for w in text.split() if w not in STOP_WORDS])
+
+
+def nltk_lemmatizer():
+    """Eğitim tarafı için WordNetLemmatizer.lemmatize (nesne bir kez oluşturulur)"""
+    from nltk.stem import WordNetLemmatizer
+
+    return WordNetLemmatizer().lemmatize
+
+
+class LemmaTable:
+    """
+    Memoize edilmiş kelime -> lemma tablosu.
+
+    `fallback` verilirse (eğitim: NLTK) tabloda olmayan kelimeler ona sorulur ve
+    tabloya eklenir. Verilmezse (servis) WordNet'in isim ekleri kuralları uygulanır
+    ve adaylardan korpusta bilinen en kısa lemma seçilir.
+    """
+
+    # Servis tarafında tablo dışı kelimeler için önbellek sınırı
+    MAX_CACHED = 200_000
+
+    def __init__(self, lemmas=None, fallback=None):
+        self._lemmas = dict(lemmas or {})
+        self._known = set(self._lemmas.values())
+        self._fallback = fallback
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._lemmas)
+
+    def __call__(self, word: str) -> str:
+        lemma = self._lemmas.get(word)
+        if lemma is not None:
+            return lemma
+        if self._fallback is not None:
+            lemma = self._lemmas[word] = self._fallback(word)
+            self._known.add(lemma)
+            return lemma
+        lemma = self._cache.get(word)
+        if lemma is None:
+            lemma = self.apply_rules(word)
+            if len(self._cache) < self.MAX_CACHED:
+                self._cache[word] = lemma
+        return lemma
+
+    def apply_rules(self, word: str) -> str:
+        candidates = [word[:-len(old)] + new for old, new in _NOUN_SUFFIXES if word.endswith(old)]
+        known = [c for c in candidates if c in self._known]
+        return min(known, key=len) if known else word
+
+    def save(self, path):
+        """Tabloyu JSON olarak yaz (kendisine eşlenen kelimeler ayrı listede tutulur)"""
+        identity = sorted(w for w, l in self._lemmas.items() if w == l)
+        changed = {w: l for w, l in sorted(self._lemmas.items()) if w != l}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"identity": identity, "lemmas": changed}, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            print(f"⚠️ Lemma tablosu bulunamadı ({path}); yalnızca ek kuralları kullanılacak.")
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        lemmas = {w: w for w in data["identity"]}
+        lemmas.update(data["lemmas"])
+        return cls(lemmas)
+
+    @classmethod
+    def from_processed(cls, raw_texts, clean_texts):
+        """
+        Ham metinlerle NLTK ile temizlenmiş hallerini kelime kelime hizalayarak tablo üretir.
+        Kelime sayısı tutmayan satırlar atlanır; (hizalanan, atlanan) sayıları da döner.
+        """
+        lemmas, aligned, skipped = {}, 0, 0
+        for raw, clean in zip(raw_texts, clean_texts):
+            words = normalize(raw, str).split()
+            lemma_words = str(clean).split()
+            if len(words) != len(lemma_words):
+                skipped += 1
+                continue
+            aligned += 1
+            lemmas.update(zip(words, lemma_words))
+        return cls(lemmas), aligned, skipped
+
+
+def main():
+    if sys.argv[1:] != ["build-table"]:
+        print("Kullanım: python text_normalization.py build-table")
+        sys.exit(2)
+    import pandas as pd
+
+    raw_texts, clean_texts = [], []
+    for name in ("processed_original.csv", "processed_augmented.csv"):
+        df = pd.read_csv(os.path.join(BASE_DIR, "data", name)).dropna(subset=["plot", "clean_text"])
+        raw_texts += df["plot"].tolist()
+        clean_texts += df["clean_text"].tolist()
+    table, aligned, skipped = LemmaTable.from_processed(raw_texts, clean_texts)
+    table.save(LEMMA_TABLE_PATH)
+    print(f"✅ {len(table)} kelimelik lemma tablosu kaydedildi: {LEMMA_TABLE_PATH} "
+          f"({aligned} satır hizalandı, {skipped} atlandı)")
+
+
+if __name__ == "__main__":
+    main()
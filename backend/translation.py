@@ -0,0 +1,189 @@
+"""
+CineAI Pro - Çeviri Katmanı
+Uzun senaryoları cümle sınırlarından parçalara böler, parçaları paralel çevirir
+ve orijinal sırayla birleştirir.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from deep_translator import GoogleTranslator
+
+from admission import DeadlineExceeded
+from metrics import TRANSLATION_FAILURES
+from text_normalization import MAX_TEXT_CHARS
+
+# "google" (varsayılan) veya ağ gerektirmeyen "stub" (benchmark/test için)
+TRANSLATOR_BACKEND = os.environ.get("CINEAI_TRANSLATOR", "google")
+# Stub çevirmenin her çağrıda simüle ettiği sabit gecikme (ms) ve karakter başına gecikme (µs)
+STUB_TRANSLATOR_DELAY_MS = float(os.environ.get("CINEAI_STUB_TRANSLATOR_DELAY_MS", "0"))
+STUB_TRANSLATOR_US_PER_CHAR = float(os.environ.get("CINEAI_STUB_TRANSLATOR_US_PER_CHAR", "0"))
+# Google Translate tek çağrıda 5000 karakterden kısa metin kabul eder
+CHUNK_CHARS = int(os.environ.get("CINEAI_TRANSLATE_CHUNK_CHARS", "4500"))
+# Aynı anda çevrilen en fazla parça sayısı
+TRANSLATE_WORKERS = int(os.environ.get("CINEAI_TRANSLATE_WORKERS", "8"))
+# 1 ise metnin tamamı çevrilir; aksi halde yalnızca vektörleştirilecek kısım (MAX_TEXT_CHARS) çevrilir
+TRANSLATE_FULL_TEXT = os.environ.get("CINEAI_TRANSLATE_FULL_TEXT", "0") == "1"
+# Türkçe -> İngilizce uzunluk farkı için pay: MAX_TEXT_CHARS İngilizce karakteri kesin doldurmak için
+BUDGET_FACTOR = 1.5
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+|\s*\n+\s*')
+_local = threading.local()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class StubTranslator:
+    """
+    Ağ çağrısı yapmayan yerel çevirmen - metni aynen döndürür.
+    Google ile aynı 5000 karakter sınırını uygular ve isteğe bağlı gecikme ekler.
+    """
+
+    max_chars = 5000
+
+    def __init__(self, delay_ms: float = 0, us_per_char: float = 0):
+        self.delay_seconds = delay_ms / 1000
+        self.seconds_per_char = us_per_char / 1e6
+
+    def translate(self, text: str) -> str:
+        if len(text) >= self.max_chars:
+            raise ValueError(f"Metin {self.max_chars} karakter sınırını aşıyor ({len(text)})")
+        delay = self.delay_seconds + self.seconds_per_char * len(text)
+        if delay:
+            time.sleep(delay)
+        return text
+
+
+def create_translator():
+    """CINEAI_TRANSLATOR ayarına göre çevirmeni oluştur"""
+    if TRANSLATOR_BACKEND == "stub":
+        return StubTranslator(STUB_TRANSLATOR_DELAY_MS, STUB_TRANSLATOR_US_PER_CHAR)
+    return GoogleTranslator(source='tr', target='en')
+
+
+def get_translator():
+    """
+    Thread başına bir çevirmen.
+    GoogleTranslator her çağrıda kendi URL parametrelerini değiştirdiği için
+    thread'ler arasında paylaşılamaz.
+    """
+    translator = getattr(_local, "translator", None)
+    if translator is None:
+        translator = _local.translator = create_translator()
+    return translator
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS, thread_name_prefix="translate")
+    return _pool
+
+
+def warmup():
+    """Çevirmeni ve thread havuzunu istek gelmeden önce oluştur"""
+    get_translator()
+    _get_pool()
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s for s in _SENTENCE_BOUNDARY.split(text) if s]
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_CHARS, budget: int = None) -> list[str]:
+    """
+    Metni cümle sınırlarından en fazla `max_chars` karakterlik parçalara böler.
+    `budget` verilirse toplam uzunluk budget'ı geçtiği cümlede durulur.
+    Tek başına max_chars'tan uzun cümleler boşluklardan (gerekirse sert) bölünür.
+    """
+    chunks, current, size, total = [], [], 0, 0
+    for sentence in split_sentences(text):
+        pieces = [sentence]
+        if len(sentence) > max_chars:
+            pieces = _split_long(sentence, max_chars)
+        for piece in pieces:
+            if current and size + 1 + len(piece) > max_chars:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + (1 if size else 0)
+            total += len(piece) + 1
+            if budget is not None and total >= budget:
+                chunks.append(" ".join(current))
+                return chunks
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def translation_budget():
+    """Çevrilecek en fazla kaynak karakter (None = tamamı)"""
+    if TRANSLATE_FULL_TEXT:
+        return None
+    return int(MAX_TEXT_CHARS * BUDGET_FACTOR)
+
+
+def _translate_chunk(chunk: str):
+    try:
+        return get_translator().translate(chunk) or chunk, False
+    except Exception as e:
+        TRANSLATION_FAILURES.inc()
+        print(f"Çeviri hatası: {e}")
+        # Çeviri başarısız olursa orijinal parçayı kullan
+        return chunk, True
+
+
+def _translate_before(chunk: str, deadline):
+    # Havuzda sırası geldiğinde süre dolmuşsa çevirmeni hiç çağırma
+    deadline.check("translate")
+    return _translate_chunk(chunk)
+
+
+def translate_chunks(text: str, budget=None, deadline=None):
+    """
+    Metni parçalar halinde çevirir.
+    (çeviri, başarısız parça sayısı) döndürür; parçalar orijinal sırayla birleştirilir.
+    `deadline` verilirse parçalar her zaman havuzda çevrilir ve en fazla kalan süre
+    kadar beklenir; süre dolarsa başlamamış parçalar iptal edilir ve DeadlineExceeded
+    fırlatılır (takılan ağ çağrısı arka planda biter, isteği bekletmez).
+    """
+    chunks = chunk_text(text, CHUNK_CHARS, budget)
+    if not chunks:
+        return text, 0
+    if deadline is not None:
+        deadline.check("translate")
+        futures = [_get_pool().submit(_translate_before, chunk, deadline) for chunk in chunks]
+        _, pending = wait(futures, timeout=deadline.timeout())
+        if pending:
+            for future in pending:
+                future.cancel()
+            raise DeadlineExceeded("translate")
+        results = [future.result() for future in futures]
+    elif len(chunks) == 1:
+        results = [_translate_chunk(chunks[0])]
+    else:
+        results = list(_get_pool().map(_translate_chunk, chunks))
+    return " ".join(r[0] for r in results), sum(r[1] for r in results)
+
+
+def translate_to_english(text: str, deadline=None) -> str:
+    """Türkçe metni İngilizceye çevir (yalnızca vektörleştirilecek kadarını, paralel parçalarla)"""
+    return translate_chunks(text, translation_budget(), deadline)[0]
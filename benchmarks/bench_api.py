@@ -0,0 +1,364 @@
+"""
+CineAI Pro - API Yük Testi ve Benchmark
+
+FastAPI uygulamasını yerel stub çevirmen ile başlatır, data/ altındaki gerçek
+film özetlerini istenen eşzamanlılık ve istek karışımıyla gönderir; RPS, gecikme
+yüzdelikleri ve worker başına CPU/RSS değerlerini JSON olarak raporlar.
+
+Örnekler:
+    python benchmarks/bench_api.py --workers 2 --concurrency 16 --duration 30 --output run.json
+    python benchmarks/bench_api.py --mix single=0.7,batch=0.3 --lengths short=0.5,long=0.5
+    python benchmarks/bench_api.py compare eski.json yeni.json
+"""
+
+import argparse
+import csv
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+# --- VERİ ---
+def load_plots(seed: int) -> list[str]:
+    """processed_augmented.csv ve poe_verisi.csv içindeki ham özetleri oku"""
+    plots = []
+    sources = [
+        (os.path.join(DATA_DIR, "processed_augmented.csv"), "plot"),
+        (os.path.join(DATA_DIR, "poe_verisi.csv"), "Plot"),
+    ]
+    for path, column in sources:
+        if not os.path.exists(path):
+            continue
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                text = (row.get(column) or "").strip()
+                if len(text) >= 10:
+                    plots.append(text)
+    if not plots:
+        raise SystemExit("❌ data/ altında özet bulunamadı.")
+    random.Random(seed).shuffle(plots)
+    return plots
+
+
+def make_long_text(rng: random.Random, plots: list[str], target_chars: int) -> str:
+    """Birden fazla özeti birleştirerek senaryo uzunluğunda bir metin üret"""
+    parts, size = [], 0
+    while size < target_chars:
+        plot = rng.choice(plots)
+        parts.append(plot)
+        size += len(plot) + 1
+    return " ".join(parts)
+
+
+def parse_mix(spec: str) -> list[tuple[str, float]]:
+    """'single=0.8,batch=0.2' -> [('single', 0.8), ('batch', 0.2)]"""
+    pairs = []
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        pairs.append((name.strip(), float(weight or 1)))
+    return pairs
+
+
+# --- SUNUCU ---
+def start_server(args) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["CINEAI_TRANSLATOR"] = "stub"
+    env["CINEAI_STUB_TRANSLATOR_DELAY_MS"] = str(args.translator_delay_ms)
+    env.update(dict(item.split("=", 1) for item in args.server_env))
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+
+
+def wait_until_ready(port: int, timeout: float):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/health")
+            body = json.loads(conn.getresponse().read())
+            conn.close()
+            if body.get("model_loaded"):
+                return
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.25)
+    raise SystemExit("❌ Sunucu zamanında hazır olmadı.")
+
+
+def worker_pids(master_pid: int) -> list[int]:
+    """uvicorn master'ının worker süreçleri (tek worker'da master'ın kendisi)"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        # fields[1] = ppid
+        if int(fields[1]) == master_pid:
+            children.append(int(entry))
+    # multiprocessing'in resource_tracker süreci worker değildir
+    workers = [pid for pid in children if "resource_tracker" not in _cmdline(pid)]
+    return workers or [master_pid]
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return ""
+
+
+def process_stats(pid: int) -> dict:
+    """/proc üzerinden CPU süresi (s), güncel ve tepe RSS (MiB)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLK_TCK
+    rss_mib = int(fields[21]) * PAGE_SIZE / 2**20
+    peak_mib = rss_mib
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                peak_mib = int(line.split()[1]) / 1024
+    return {"cpu_seconds": cpu_seconds, "rss_mib": rss_mib, "peak_rss_mib": peak_mib}
+
+
+# --- YÜK ---
+class LoadGenerator:
+    def __init__(self, args, plots):
+        self.args = args
+        self.plots = plots
+        self.short_plots = [p for p in plots if len(p) <= args.short_max_chars] or plots
+        self.mix = parse_mix(args.mix)
+        self.lengths = parse_mix(args.lengths)
+        self.results = []
+        self._lock = threading.Lock()
+
+    def _make_request(self, rng):
+        kind = rng.choices([k for k, _ in self.mix], [w for _, w in self.mix])[0]
+        length = rng.choices([k for k, _ in self.lengths], [w for _, w in self.lengths])[0]
+
+        def one_text():
+            if length == "long":
+                return make_long_text(rng, self.plots, self.args.long_chars)
+            return rng.choice(self.short_plots)
+
+        if kind == "batch":
+            texts = [one_text() for _ in range(self.args.batch_size)]
+            return kind, length, "/predict/batch", {"texts": texts}, len(texts)
+        return kind, length, "/predict", {"text": one_text()}, 1
+
+    def _client(self, client_id: int, deadline: float, record_after: float):
+        rng = random.Random(self.args.seed * 1000 + client_id)
+        conn = http.client.HTTPConnection("127.0.0.1", self.args.port, timeout=60)
+        local = []
+        while time.perf_counter() < deadline:
+            kind, length, path, payload, n_texts = self._make_request(rng)
+            body = json.dumps(payload)
+            started = time.perf_counter()
+            try:
+                conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", self.args.port, timeout=60)
+                status = 0
+            finished = time.perf_counter()
+            if started >= record_after:
+                local.append((kind, length, status, finished - started, n_texts, len(body)))
+            if status in (429, 503) and self.args.reject_backoff_ms:
+                # Reddedilen istemci hemen tekrar denemesin (tek CPU'da boş döngü yükü bozar)
+                time.sleep(self.args.reject_backoff_ms / 1000)
+        conn.close()
+        with self._lock:
+            self.results.extend(local)
+
+    def run(self, on_measure_start):
+        """Isınma bitince `on_measure_start` çağrılır; ölçüm süresini döndürür"""
+        now = time.perf_counter()
+        record_after = now + self.args.warmup
+        deadline = record_after + self.args.duration
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            for i in range(self.args.concurrency):
+                pool.submit(self._client, i, deadline, record_after)
+            time.sleep(max(0.0, record_after - time.perf_counter()))
+            on_measure_start()
+        return self.args.duration
+
+
+# --- RAPOR ---
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def latency_summary(latencies):
+    return {
+        f"p{q}": round(percentile(latencies, q) * 1000, 2) if latencies else None
+        for q in (50, 90, 95, 99)
+    } | {
+        "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+        "max": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+def summarize(samples, duration):
+    latencies = sorted(s[3] for s in samples)
+    ok = [s for s in samples if s[2] == 200]
+    statuses = {}
+    for s in samples:
+        statuses[str(s[2])] = statuses.get(str(s[2]), 0) + 1
+    return {
+        "requests": len(samples),
+        "ok": len(ok),
+        "status_counts": statuses,
+        "rps": round(len(ok) / duration, 2),
+        "texts_per_second": round(sum(s[4] for s in ok) / duration, 2),
+        "latency_ms": latency_summary(latencies),
+        # Hızlı reddedilen (429) istekler yüzdelikleri düşürmesin diye başarılılar ayrıca
+        "ok_latency_ms": latency_summary(sorted(s[3] for s in ok)),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(args) -> dict:
+    plots = load_plots(args.seed)
+    server = start_server(args)
+    try:
+        wait_until_ready(args.port, args.startup_timeout)
+        pids = worker_pids(server.pid)
+        before = {}
+
+        print(f"⏳ {args.concurrency} istemci, {args.warmup}s ısınma + {args.duration}s ölçüm...")
+        generator = LoadGenerator(args, plots)
+        duration = generator.run(lambda: before.update({pid: process_stats(pid) for pid in pids}))
+
+        workers = []
+        for pid in pids:
+            after = process_stats(pid)
+            workers.append({
+                "pid": pid,
+                "cpu_seconds": round(after["cpu_seconds"] - before[pid]["cpu_seconds"], 3),
+                "cpu_percent": round((after["cpu_seconds"] - before[pid]["cpu_seconds"]) / duration * 100, 1),
+                "rss_mib": round(after["rss_mib"], 1),
+                "peak_rss_mib": round(after["peak_rss_mib"], 1),
+            })
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    samples = generator.results
+    by_kind = {}
+    for key in sorted({(s[0], s[1]) for s in samples}):
+        by_kind[f"{key[0]}/{key[1]}"] = summarize([s for s in samples if (s[0], s[1]) == key], duration)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                k: v for k, v in vars(args).items() if k not in ("command", "func")
+            },
+        },
+        "overall": summarize(samples, duration),
+        "by_kind": by_kind,
+        "workers": workers,
+    }
+
+
+def compare(args):
+    """İki benchmark JSON'unu karşılaştır (RPS ve gecikme yüzdelikleri)"""
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print(f"📊 {old['meta']['commit']} -> {new['meta']['commit']}")
+    sections = ["overall"] + sorted(set(old["by_kind"]) & set(new["by_kind"]))
+    for section in sections:
+        a = old["overall"] if section == "overall" else old["by_kind"][section]
+        b = new["overall"] if section == "overall" else new["by_kind"][section]
+        rows = [("rps", a["rps"], b["rps"])]
+        rows += [(k, a["latency_ms"][k], b["latency_ms"][k]) for k in ("p50", "p95", "p99")]
+        print(f"\n[{section}]")
+        for name, x, y in rows:
+            change = f"{(y - x) / x * 100:+.1f}%" if x and y is not None else "n/a"
+            print(f"   {name:<5} {x!s:>10} -> {y!s:>10}  ({change})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CineAI Pro API benchmark")
+    sub = parser.add_subparsers(dest="command")
+
+    cmp_parser = sub.add_parser("compare", help="İki sonuç dosyasını karşılaştır")
+    cmp_parser.add_argument("old")
+    cmp_parser.add_argument("new")
+
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı")
+    parser.add_argument("--concurrency", type=int, default=8, help="Eşzamanlı istemci sayısı")
+    parser.add_argument("--duration", type=float, default=20, help="Ölçüm süresi (s)")
+    parser.add_argument("--warmup", type=float, default=3, help="Ölçülmeyen ısınma süresi (s)")
+    parser.add_argument("--mix", default="single=0.8,batch=0.2", help="İstek türü ağırlıkları")
+    parser.add_argument("--lengths", default="short=0.7,long=0.3", help="Metin uzunluğu ağırlıkları")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--short-max-chars", type=int, default=400)
+    parser.add_argument("--long-chars", type=int, default=4000, help="Uzun metinlerin hedef uzunluğu")
+    parser.add_argument("--translator-delay-ms", type=float, default=0, help="Stub çeviri gecikmesi")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Sunucuya ek ortam değişkeni (tekrarlanabilir)")
+    parser.add_argument("--reject-backoff-ms", type=float, default=0,
+                        help="429/503 alan istemcinin tekrar denemeden önce beklediği süre")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--output", help="JSON sonucunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        compare(args)
+        return
+
+    result = run_benchmark(args)
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ Sonuçlar kaydedildi: {args.output}")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+CineAI Pro - Özellik Seçimi Benchmark'ı
+
+Augmented eğitimle aynı veri ayrımı üzerinde, seçim yöntemi (chi2 / mi / l1) ve
+k değerlerine göre şunları raporlar:
+    * eğitim süresi (seçici + model fit)
+    * tek istek çıkarım gecikmesi (vektörleştirici + seçici + predict_proba, p50/p95)
+    * paket boyutu (model + vektörleştirici, joblib)
+    * standart ve esnek doğruluk
+
+Örnek:
+    python benchmarks/bench_feature_selection.py --model rf --methods chi2,mi,l1 \
+        --ks 1000,2000,5000 --dtypes float64,float32 --output fs.json
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "processing_and_training"))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+
+def make_model(name):
+    """train_models_augmented.py ile aynı hiperparametreler"""
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.svm import LinearSVC
+
+    nb = MultinomialNB(alpha=0.01)
+    svm = CalibratedClassifierCV(LinearSVC(class_weight='balanced', dual=False))
+    rf = RandomForestClassifier(n_estimators=200, class_weight='balanced', n_jobs=-1, random_state=42)
+    if name == "voting":
+        return VotingClassifier(estimators=[('nb', nb), ('svm', svm), ('rf', rf)], voting='soft')
+    return {"nb": nb, "svm": svm, "rf": rf}[name]
+
+
+def package_size_mib(model, vectorizer):
+    import joblib
+
+    buffer = io.BytesIO()
+    joblib.dump({"best_model": model, "vectorizer": vectorizer}, buffer)
+    return buffer.tell() / 2**20
+
+
+def request_latency_ms(model, vectorizer, texts):
+    times = []
+    for text in texts:
+        started = time.perf_counter()
+        model.predict_proba(vectorizer.transform([text]))
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Özellik seçimi: süre / gecikme / boyut / doğruluk")
+    parser.add_argument("--model", default="rf", choices=("rf", "nb", "svm", "voting"))
+    parser.add_argument("--methods", default="chi2,mi,l1")
+    parser.add_argument("--ks", default="1000,2000,5000")
+    parser.add_argument("--dtypes", default="float64,float32")
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--output", help="JSON sonucunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    from feature_selection import make_selector, make_tfidf, package_vectorizer
+    from train_models_augmented import calculate_flexible_accuracy, split_train_test
+
+    train_df, test_df, _ = split_train_test(pd.read_csv(os.path.join(DATA_DIR, "processed_augmented.csv")))
+    X_train, y_train = train_df['clean_text'].fillna(""), train_df['genre']
+    X_test, y_test = test_df['clean_text'].fillna(""), test_df['genre']
+    latency_texts = X_test.tolist()[:args.latency_samples]
+
+    configs = [("none", None)]
+    configs += [(m, int(k)) for m in args.methods.split(",") for k in args.ks.split(",")]
+
+    results = []
+    header = (f"{'dtype':>8} {'yöntem':>6} {'k':>6} {'eğitim (s)':>10} {'p50 (ms)':>9} "
+              f"{'p95 (ms)':>9} {'boyut (MiB)':>11} {'acc':>7} {'esnek acc':>9}")
+    print(f"Model: {args.model}, eğitim {len(X_train)} / test {len(X_test)} satır\n{header}")
+    for dtype in args.dtypes.split(","):
+        tfidf = make_tfidf(dtype)
+        X_train_vec = tfidf.fit_transform(X_train)
+        X_test_vec = tfidf.transform(X_test)
+        for method, k in configs:
+            selector = make_selector(method, k)
+            model = make_model(args.model)
+            started = time.perf_counter()
+            if selector is not None:
+                X_tr = selector.fit_transform(X_train_vec, y_train)
+                X_te = selector.transform(X_test_vec)
+            else:
+                X_tr, X_te = X_train_vec, X_test_vec
+            model.fit(X_tr, y_train)
+            train_seconds = time.perf_counter() - started
+
+            y_pred = model.predict(X_te)
+            vectorizer = package_vectorizer(tfidf, selector)
+            p50, p95 = request_latency_ms(model, vectorizer, latency_texts)
+            row = {
+                "dtype": dtype,
+                "method": method,
+                "k": X_tr.shape[1],
+                "train_seconds": round(train_seconds, 2),
+                "latency_p50_ms": round(p50, 2),
+                "latency_p95_ms": round(p95, 2),
+                "size_mib": round(package_size_mib(model, vectorizer), 2),
+                "accuracy": round(float((y_pred == y_test.to_numpy()).mean()), 4),
+                "flexible_accuracy": round(calculate_flexible_accuracy(test_df['all_genres'], y_pred), 4),
+            }
+            results.append(row)
+            print(f"{dtype:>8} {method:>6} {row['k']:>6} {row['train_seconds']:>10} {row['latency_p50_ms']:>9} "
+                  f"{row['latency_p95_ms']:>9} {row['size_mib']:>11} {row['accuracy']:>7} "
+                  f"{row['flexible_accuracy']:>9}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"✅ Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+CineAI Pro - Aşırı Yük (Overload) Testi
+
+Kapasitenin çok üzerinde eşzamanlı istemciyle, yavaş (takılan) stub çevirmen
+altında aynı yükü üç sunucu ayarıyla çalıştırır ve kuyruk gecikmesini karşılaştırır:
+    * unbounded  - sınırsız sıra, süre sınırı yok (eski davranışa eşdeğer birikme)
+    * bounded    - sınırlı sıra (429 + Retry-After) ve istek süre sınırı (503)
+    * degraded   - bounded + sıra yarıya dolunca çeviriyi atlama
+
+Sınırlı senaryolarda tüm yanıtların ve başarılı yanıtların p99'u süre sınırı
+(+ pay) altında kalmazsa çıkış kodu 1 olur.
+
+Örnek:
+    python benchmarks/bench_overload.py --concurrency 64 --translator-delay-ms 400 \
+        --deadline-ms 2000 --duration 20 --output overload.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_api import run_benchmark
+
+
+def scenario_env(name, args):
+    common = [f"CINEAI_MAX_IN_FLIGHT={args.max_in_flight}", "CINEAI_RETRY_AFTER_SECONDS=1"]
+    if name == "unbounded":
+        return common + ["CINEAI_MAX_QUEUE=1000000", "CINEAI_REQUEST_DEADLINE_MS=0"]
+    bounded = common + [f"CINEAI_MAX_QUEUE={args.max_queue}", f"CINEAI_REQUEST_DEADLINE_MS={args.deadline_ms}"]
+    if name == "degraded":
+        return bounded + ["CINEAI_DEGRADED_MODE=skip_translation",
+                          f"CINEAI_DEGRADE_QUEUE_DEPTH={max(1, args.max_queue // 2)}"]
+    return bounded
+
+
+def bench_args(args, server_env):
+    """bench_api.run_benchmark'ın beklediği argümanlar (yalnızca tekil, kısa istekler)"""
+    return argparse.Namespace(
+        workers=1, concurrency=args.concurrency, duration=args.duration, warmup=args.warmup,
+        mix="single=1", lengths="short=1", batch_size=1, short_max_chars=400, long_chars=4000,
+        translator_delay_ms=args.translator_delay_ms, server_env=server_env,
+        reject_backoff_ms=args.reject_backoff_ms, port=args.port, seed=args.seed,
+        startup_timeout=args.startup_timeout,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aşırı yük altında kuyruk gecikmesi testi")
+    parser.add_argument("--scenarios", default="unbounded,bounded,degraded")
+    parser.add_argument("--concurrency", type=int, default=64, help="Eşzamanlı istemci sayısı")
+    parser.add_argument("--translator-delay-ms", type=float, default=400, help="Takılan çevirmen gecikmesi")
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--deadline-ms", type=float, default=2000)
+    parser.add_argument("--slack-ms", type=float, default=250, help="p99 kontrolü için süre sınırına eklenen pay")
+    parser.add_argument("--reject-backoff-ms", type=float, default=200)
+    parser.add_argument("--duration", type=float, default=20, help="Ölçüm süresi (s)")
+    parser.add_argument("--warmup", type=float, default=5, help="Ölçülmeyen ısınma süresi (s)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--output", help="JSON sonucunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    limit_ms = args.deadline_ms + args.slack_ms
+    results, failures = {}, []
+    for name in args.scenarios.split(","):
+        print(f"\n🚦 Senaryo: {name}")
+        result = run_benchmark(bench_args(args, scenario_env(name, args)))
+        results[name] = result
+        overall = result["overall"]
+        print(f"   durumlar: {overall['status_counts']}, başarılı RPS: {overall['rps']}")
+        print(f"   tüm yanıtlar p50/p99: {overall['latency_ms']['p50']} / {overall['latency_ms']['p99']} ms, "
+              f"başarılı p50/p99: {overall['ok_latency_ms']['p50']} / {overall['ok_latency_ms']['p99']} ms")
+        if name != "unbounded":
+            for key in ("latency_ms", "ok_latency_ms"):
+                p99 = overall[key]["p99"]
+                if p99 is not None and p99 > limit_ms:
+                    failures.append(f"{name} {key} p99 {p99} ms > {limit_ms} ms")
+
+    print("\n📊 Özet (ms)")
+    print(f"{'senaryo':>10} {'200':>6} {'429':>6} {'503':>6} {'p50':>9} {'p99':>9} {'200 p99':>9} {'max':>9}")
+    for name, result in results.items():
+        overall = result["overall"]
+        counts = overall["status_counts"]
+        print(f"{name:>10} {counts.get('200', 0):>6} {counts.get('429', 0):>6} {counts.get('503', 0):>6} "
+              f"{overall['latency_ms']['p50']!s:>9} {overall['latency_ms']['p99']!s:>9} "
+              f"{overall['ok_latency_ms']['p99']!s:>9} {overall['latency_ms']['max']!s:>9}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"✅ Sonuçlar kaydedildi: {args.output}")
+
+    if failures:
+        print("❌ Kuyruk gecikmesi sınırı aşıldı:\n   " + "\n   ".join(failures))
+        sys.exit(1)
+    print(f"✅ Sınırlı senaryolarda p99 <= {limit_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+CineAI Pro - Metin Normalizasyonu Parite Kontrolü ve Throughput Benchmark'ı
+
+Parite:
+    * Servis yolu (inference.clean_text) data/processed_*.csv içindeki her `plot` için
+      eğitimde NLTK ile üretilmiş `clean_text` ile birebir aynı çıktıyı vermelidir.
+    * Tablo dışı kelimeler için ek kurallarının doğruluğu, tablonun %10'u saklanarak ölçülür.
+    * NLTK WordNet verisi kuruluysa tablo doğrudan WordNetLemmatizer ile karşılaştırılır.
+    * inference import edildiğinde NLTK yüklenmemelidir.
+Throughput: eski servis/eğitim temizleyicileri ile ortak normalize (doküman/s).
+
+Parite bozulursa çıkış kodu 1'dir.
+
+Örnek:
+    python benchmarks/bench_text_normalization.py --repeat 3
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+
+def legacy_serving_clean_text(text):
+    """Ortak modülden önceki servis temizleyicisi (yalnızca lowercase + noktalama)"""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def legacy_training_clean_text(text):
+    """Ortak modülden önceki eğitim temizleyicisi (her çağrıda NLTK nesneleri kurar)"""
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+
+    text = str(text)[:2500]
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\d+', '', text)
+    stop_words = set(stopwords.words('english'))
+    lemmatizer = WordNetLemmatizer()
+    words = text.split()
+    cleaned = [lemmatizer.lemmatize(w) for w in words if w not in stop_words]
+    return " ".join(cleaned)
+
+
+def nltk_available():
+    try:
+        import nltk
+
+        nltk.data.find('corpora/wordnet')
+        nltk.data.find('corpora/stopwords')
+        return True
+    except (ImportError, LookupError):
+        return False
+
+
+def throughput(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalizasyon paritesi ve throughput")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-sample", type=int, default=500,
+                        help="Yavaş eski eğitim temizleyicisi için doküman sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    import inference
+    from text_normalization import LEMMA_TABLE_PATH, LemmaTable, nltk_lemmatizer, normalize
+
+    lemmas = LemmaTable.load(LEMMA_TABLE_PATH)
+    import_seconds = time.perf_counter() - started
+
+    def serve_clean_text(text):
+        return inference.clean_text(text, lemmas)
+
+    import pandas as pd
+
+    ok = True
+    nltk_at_startup = "nltk" in sys.modules
+    print(f"📦 inference import + lemma tablosu: {import_seconds * 1000:.0f} ms, NLTK yüklendi mi: {nltk_at_startup}")
+    ok &= not nltk_at_startup
+
+    # 1. Servis çıktısı == eğitim verisindeki clean_text
+    raw_texts, expected = [], []
+    for name in ("processed_original.csv", "processed_augmented.csv"):
+        df = pd.read_csv(os.path.join(DATA_DIR, name)).dropna(subset=["plot", "clean_text"])
+        raw_texts += df["plot"].astype(str).tolist()
+        expected += df["clean_text"].astype(str).tolist()
+    mismatches = [(r, e) for r, e in zip(raw_texts, expected) if serve_clean_text(r) != e]
+    print(f"🔍 Parite (servis vs eğitim clean_text): {len(raw_texts) - len(mismatches)}/{len(raw_texts)} aynı")
+    for raw, exp in mismatches[:3]:
+        print(f"   ❌ {serve_clean_text(raw)[:80]!r}\n      {exp[:80]!r}")
+    ok &= not mismatches
+
+    # 2. Tablo dışı kelimeler: ek kurallarının doğruluğu (%10 saklanarak)
+    full, _, _ = LemmaTable.from_processed(raw_texts, expected)
+    words = sorted(full._lemmas)
+    rng = random.Random(args.seed)
+    held_out = set(rng.sample(words, len(words) // 10))
+    partial = LemmaTable({w: full._lemmas[w] for w in words if w not in held_out})
+    correct = sum(partial(w) == full._lemmas[w] for w in held_out)
+    changed = [w for w in held_out if full._lemmas[w] != w]
+    correct_changed = sum(partial(w) == full._lemmas[w] for w in changed)
+    print(f"🧪 Tablo dışı kelimeler (kural): %{correct / len(held_out) * 100:.2f} doğru "
+          f"(lemması farklı olanlarda %{correct_changed / max(1, len(changed)) * 100:.2f})")
+
+    # 3. NLTK ile doğrudan karşılaştırma (veri kuruluysa)
+    has_nltk = nltk_available()
+    if has_nltk:
+        lemmatize = nltk_lemmatizer()
+        diff = [w for w in words if lemmatize(w) != full._lemmas[w]]
+        print(f"🔍 Parite (tablo vs WordNetLemmatizer): {len(words) - len(diff)}/{len(words)} aynı")
+        ok &= not diff
+    else:
+        print("⚠️ NLTK WordNet/stopwords verisi yok; NLTK karşılaştırmaları atlandı.")
+
+    # 4. Throughput
+    print("\n⏱️  Throughput (doküman/s):")
+    print(f"   eski servis clean_text:         {throughput(legacy_serving_clean_text, raw_texts, args.repeat):>10.0f}")
+    print(f"   ortak normalize (tablo):        {throughput(serve_clean_text, raw_texts, args.repeat):>10.0f}")
+    if has_nltk:
+        sample = raw_texts[:args.legacy_sample]
+        memo = LemmaTable(fallback=nltk_lemmatizer())
+        print(f"   eski eğitim clean_text_english: {throughput(legacy_training_clean_text, sample, 1):>10.0f}")
+        print(f"   ortak normalize (NLTK memo):    {throughput(lambda t: normalize(t, memo), sample, args.repeat):>10.0f}")
+
+    print("-" * 50)
+    print("✅ Parite tamam." if ok else "❌ Parite bozuk!")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+CineAI Pro - Çeviri + Tahmin Gecikmesi / Girdi Uzunluğu Benchmark'ı
+
+1 KB - 200 KB arası girdiler için üç stratejiyi karşılaştırır:
+    single   : eski davranış - tüm metin tek çağrıda (5000 karakter üstünde çeviri başarısız olur)
+    chunked  : cümle sınırlarından parçalama + paralel çeviri, metnin tamamı
+    budgeted : chunked + yalnızca vektörleştirilecek kadar metin (CINEAI_MAX_TEXT_CHARS) çevrilir
+
+Ağ yerine gecikmeyi taklit eden stub çevirmen kullanılır (sabit RTT + karakter başına süre).
+Her ölçüm çeviri, clean_text, vektörleştirme ve olasılık hesabını içerir.
+
+Örnek:
+    python benchmarks/bench_translation.py --rtt-ms 150 --us-per-char 20 --repeat 3 --output translation.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+SIZES_KB = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def build_text(plots, size_chars):
+    parts, size = [], 0
+    i = 0
+    while size < size_chars:
+        plot = plots[i % len(plots)]
+        parts.append(plot)
+        size += len(plot) + 1
+        i += 1
+    return " ".join(parts)[:size_chars]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çeviri gecikmesi / girdi uzunluğu benchmark'ı")
+    parser.add_argument("--rtt-ms", type=float, default=150, help="Çağrı başına sabit gecikme (ms)")
+    parser.add_argument("--us-per-char", type=float, default=20, help="Karakter başına gecikme (µs)")
+    parser.add_argument("--workers", type=int, default=8, help="Paralel çeviri thread sayısı")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES_KB)), help="KB cinsinden boyutlar")
+    parser.add_argument("--output", help="JSON sonucunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    # translation modülü ayarlarını import sırasında okur
+    os.environ["CINEAI_TRANSLATOR"] = "stub"
+    os.environ["CINEAI_STUB_TRANSLATOR_DELAY_MS"] = str(args.rtt_ms)
+    os.environ["CINEAI_STUB_TRANSLATOR_US_PER_CHAR"] = str(args.us_per_char)
+    os.environ["CINEAI_TRANSLATE_WORKERS"] = str(args.workers)
+    sys.path.insert(0, BACKEND_DIR)
+
+    import pandas as pd
+    import translation
+    from inference import class_probabilities, clean_text
+    from text_normalization import MAX_TEXT_CHARS
+    from model_store import load_bundle
+
+    plots = pd.read_csv(os.path.join(DATA_DIR, "processed_augmented.csv"))["plot"].dropna().tolist()
+    bundle = load_bundle(lambda genre: {})
+    translation.warmup()
+
+    def single(text):
+        try:
+            return translation.get_translator().translate(text), 0
+        except Exception:
+            # Eski davranış: hata olursa metin çevrilmeden kullanılır
+            return text, 1
+
+    strategies = {
+        "single": single,
+        "chunked": lambda text: translation.translate_chunks(text, None),
+        "budgeted": lambda text: translation.translate_chunks(text, translation.translation_budget()),
+    }
+
+    results = []
+    print(f"{'Boyut':>7} {'Strateji':>9} {'Çeviri (ms)':>12} {'Toplam (ms)':>12} {'Çevrilen':>9} {'Hata':>5}")
+    for size_kb in (int(s) for s in args.sizes.split(",")):
+        text = build_text(plots, size_kb * 1024)
+        for name, translate in strategies.items():
+            translate_times, total_times = [], []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                translated, failed = translate(text)
+                translated_at = time.perf_counter()
+                X = bundle.vectorizer.transform([clean_text(translated, bundle.lemmatizer)])
+                class_probabilities(bundle.model, X)
+                finished = time.perf_counter()
+                translate_times.append((translated_at - started) * 1000)
+                total_times.append((finished - started) * 1000)
+            row = {
+                "size_kb": size_kb,
+                "strategy": name,
+                "translate_ms": round(statistics.median(translate_times), 1),
+                "total_ms": round(statistics.median(total_times), 1),
+                "translated_chars": len(translated),
+                "failed_chunks": failed,
+            }
+            results.append(row)
+            print(f"{size_kb:>5}KB {name:>9} {row['translate_ms']:>12} {row['total_ms']:>12} "
+                  f"{row['translated_chars']:>9} {failed:>5}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": vars(args) | {"max_text_chars": MAX_TEXT_CHARS},
+                "results": results,
+            }, f, indent=2)
+        print(f"✅ Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
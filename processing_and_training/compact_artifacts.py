@@ -0,0 +1,326 @@
+"""
+CineAI Pro - Artefakt Sıkıştırma (compare_select.py'den sonra çalışır)
+
+final_best_model.pkl + final_vectorizer.pkl çiftini (ve varsa final_fallback_model.pkl'i) küçültür:
+    * vektörleştiricideki `stop_words_` atılır
+    * topluluğun hiçbir üyesinde ağırlığı olmayan sözlük terimleri (ve modeldeki sütunları) silinir
+    * doğrusal katsayılar float32 olarak saklanır
+    * ağaç eşikleri float32'ye (aşağı yuvarlanarak), yaprak değerleri float16'ya indirilir
+    * dosyalar sıkıştırılarak yazılır
+
+Ağaçların düğüm yapısı sklearn'de float64 sabit olduğundan eşik ve yaprak değerleri
+bu hassasiyetlere yuvarlanıp float64 olarak tutulur; kazanç sıkıştırmadan gelir ve
+yüklenen nesneler standart sklearn modelleri olarak kalır (servis tarafı değişmez).
+
+Parite: eğitimdeki test ayrımı üzerinde en büyük olasılık sapması, tahmin uyumu ve
+esnek doğruluk farkı ölçülür. Terim silmek TF-IDF satır normunu değiştirdiği için
+budama eşikleri aşarsa budamasız sıkıştırmaya dönülür; yine aşılırsa dosyalar yazılmaz.
+Ucuz model (degraded mod) aynı vektörleştiriciyi kullandığı için aynı sütunlarla
+sıkıştırılır; budama yalnızca iki modelin de kullanmadığı terimleri siler ve parite
+ikisi için de geçmelidir.
+
+Kullanım:
+    python compact_artifacts.py              # models/final_*.compact.pkl + models/compact_report.json
+    python compact_artifacts.py --replace    # parite geçerse final_*.pkl yerine koy (eskiler *.full.pkl; yedek varsa durur)
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import VotingClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.tree import BaseDecisionTree
+from sklearn.tree._tree import Tree
+
+from train_models_augmented import calculate_flexible_accuracy, split_train_test
+
+# Paketteki seçici (backend/feature_selection.py) unpickle edilebilsin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')))
+
+# lz4 en hızlı açılandır ama ayrıca kurulmalıdır (pip install lz4)
+COMPRESS_METHODS = ("zlib", "gzip", "bz2", "lzma", "lz4", "none")
+
+
+# --- KULLANILAN ÖZELLİKLER ---
+def used_features(model, n_features):
+    """Topluluğun en az bir üyesinde ağırlığı olan sütunlar (bool maske)"""
+    if isinstance(model, CalibratedClassifierCV):
+        return np.logical_or.reduce([used_features(c.estimator, n_features) for c in model.calibrated_classifiers_])
+    if isinstance(model, VotingClassifier) or hasattr(model, "estimators_"):
+        return np.logical_or.reduce([used_features(e, n_features) for e in model.estimators_])
+    if isinstance(model, BaseDecisionTree):
+        mask = np.zeros(n_features, dtype=bool)
+        feature = model.tree_.feature
+        mask[feature[feature >= 0]] = True
+        return mask
+    if hasattr(model, "coef_"):
+        return np.any(model.coef_ != 0, axis=0)
+    if hasattr(model, "feature_log_prob_"):
+        # Tüm sınıflarda aynı log-olasılık: sonsal dağılımı değiştirmez
+        flp = model.feature_log_prob_
+        return np.any(flp != flp[0], axis=0)
+    return np.ones(n_features, dtype=bool)
+
+
+# --- MODEL ---
+def _compact_tree(tree, columns, leaf_dtype):
+    remap = np.full(tree.n_features, -1, dtype=np.intp)
+    remap[columns] = np.arange(len(columns))
+    state = tree.__getstate__()
+    nodes = state["nodes"].copy()
+    split = nodes["feature"] >= 0
+    nodes["feature"][split] = remap[nodes["feature"][split]]
+    # Ağaçlar X'i float32 ile karşılaştırır: eşiği aşağıdaki en yakın float32'ye indirmek kararı değiştirmez
+    threshold = nodes["threshold"]
+    threshold32 = threshold.astype(np.float32)
+    too_high = threshold32 > threshold
+    threshold32[too_high] = np.nextafter(threshold32[too_high], np.float32(-np.inf))
+    nodes["threshold"] = threshold32
+    state["nodes"] = nodes
+    state["values"] = state["values"].astype(leaf_dtype).astype(np.float64)
+    compact = Tree(len(columns), tree.n_classes, tree.n_outputs)
+    compact.__setstate__(state)
+    return compact
+
+
+def compact_model(model, columns, leaf_dtype=np.float16):
+    """Modeli (yerinde) `columns` sütunlarına indirger ve ağırlıklarını küçültür"""
+    if isinstance(model, CalibratedClassifierCV):
+        for calibrated in model.calibrated_classifiers_:
+            compact_model(calibrated.estimator, columns, leaf_dtype)
+    elif isinstance(model, VotingClassifier) or hasattr(model, "estimators_"):
+        for estimator in model.estimators_:
+            compact_model(estimator, columns, leaf_dtype)
+    elif isinstance(model, BaseDecisionTree):
+        model.tree_ = _compact_tree(model.tree_, columns, leaf_dtype)
+    elif hasattr(model, "coef_"):
+        model.coef_ = model.coef_[:, columns].astype(np.float32)
+    elif hasattr(model, "feature_log_prob_"):
+        model.feature_log_prob_ = model.feature_log_prob_[:, columns].astype(np.float32)
+        model.feature_count_ = model.feature_count_[:, columns].astype(np.float32)
+    # VotingClassifier gibi bazı modellerde n_features_in_ üyelerden türetilen bir property'dir
+    if "n_features_in_" in vars(model):
+        model.n_features_in_ = len(columns)
+    return model
+
+
+# --- VEKTÖRLEŞTİRİCİ ---
+def compact_vectorizer(vectorizer, columns):
+    """
+    Yalnızca `columns` sütunlarını üreten TF-IDF. Seçici içeren Pipeline tek bir
+    TfidfVectorizer'a indirgenir. Terim silinirse satır normu (l2) değişeceği için
+    olasılıklar birebir aynı kalmaz; sapma parite kontrolünde ölçülür.
+    """
+    if isinstance(vectorizer, Pipeline):
+        tfidf, selector = vectorizer.steps[0][1], vectorizer.steps[-1][1]
+        n_model_features = len(selector.get_support(indices=True))
+        if len(columns) == n_model_features:
+            # Budanacak terim yok: Pipeline'ı koru, normlar birebir aynı kalsın
+            compact = copy.deepcopy(vectorizer)
+            if hasattr(compact.steps[0][1], "stop_words_"):
+                del compact.steps[0][1].stop_words_
+            return compact
+        vocab_columns = selector.get_support(indices=True)[columns]
+    else:
+        tfidf, vocab_columns = vectorizer, columns
+
+    terms = np.empty(len(tfidf.vocabulary_), dtype=object)
+    for term, i in tfidf.vocabulary_.items():
+        terms[i] = term
+    compact = copy.deepcopy(tfidf)
+    if hasattr(compact, "stop_words_"):
+        del compact.stop_words_
+    compact.vocabulary_ = {term: i for i, term in enumerate(terms[vocab_columns])}
+    compact.idf_ = tfidf.idf_[vocab_columns]
+    compact._tfidf.n_features_in_ = len(vocab_columns)
+    return compact
+
+
+# --- ÖLÇÜM ---
+def load_seconds(model_path, vectorizer_path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        joblib.load(model_path)
+        joblib.load(vectorizer_path)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def parity_split(data_path):
+    """Eğitimdeki test ayrımı (train_models_augmented.split_train_test)"""
+    _, test_df, _ = split_train_test(pd.read_csv(data_path))
+    return test_df['clean_text'].fillna(""), test_df['all_genres']
+
+
+def check_parity(model, vectorizer, compact, compact_vec, texts, all_genres):
+    proba_full = model.predict_proba(vectorizer.transform(texts))
+    proba_compact = compact.predict_proba(compact_vec.transform(texts))
+    pred_full = model.classes_[proba_full.argmax(axis=1)]
+    pred_compact = compact.classes_[proba_compact.argmax(axis=1)]
+    flex_full = calculate_flexible_accuracy(all_genres, pred_full)
+    flex_compact = calculate_flexible_accuracy(all_genres, pred_compact)
+    return {
+        "rows": len(texts),
+        "max_probability_deviation": float(np.abs(proba_full - proba_compact).max()),
+        "prediction_agreement": float((pred_full == pred_compact).mean()),
+        "flexible_accuracy_before": flex_full,
+        "flexible_accuracy_after": flex_compact,
+        "flexible_accuracy_delta": flex_compact - flex_full,
+    }
+
+
+def with_suffix(path, suffix):
+    """'models/final_best_model.pkl', '.compact' -> 'models/final_best_model.compact.pkl'"""
+    root, ext = os.path.splitext(path)
+    return root + suffix + ext
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    models_dir = os.path.abspath(os.path.join(current_dir, '..', 'models'))
+    data_dir = os.path.abspath(os.path.join(current_dir, '..', 'data'))
+
+    parser = argparse.ArgumentParser(description="Final model/vektörleştirici sıkıştırma")
+    parser.add_argument("--model", default=os.path.join(models_dir, 'final_best_model.pkl'))
+    parser.add_argument("--vectorizer", default=os.path.join(models_dir, 'final_vectorizer.pkl'))
+    parser.add_argument("--fallback", default=os.path.join(models_dir, 'final_fallback_model.pkl'),
+                        help="Degraded modda kullanılan ucuz model (varsa aynı sütunlarla sıkıştırılır)")
+    parser.add_argument("--data", default=os.path.join(data_dir, 'processed_augmented.csv'))
+    parser.add_argument("--compress", default="zlib", choices=COMPRESS_METHODS)
+    parser.add_argument("--level", type=int, default=3, help="Sıkıştırma seviyesi (1-9)")
+    parser.add_argument("--leaf-dtype", default="float16", choices=("float16", "float32"))
+    parser.add_argument("--no-prune", action="store_true", help="Sözlük budamasını kapat")
+    parser.add_argument("--max-prob-deviation", type=float, default=0.01)
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.002,
+                        help="İzin verilen en fazla esnek doğruluk kaybı (0.002 = 0.2 puan)")
+    parser.add_argument("--repeat", type=int, default=3, help="Yükleme süresi ölçüm tekrarı")
+    parser.add_argument("--replace", action="store_true", help="Parite geçerse final_*.pkl yerine koy")
+    args = parser.parse_args()
+
+    if args.replace:
+        # İkinci bir --replace sıkıştırılmış dosyaları *.full.pkl yedeklerinin üzerine yazardı
+        backups = [with_suffix(p, ".full") for p in (args.model, args.vectorizer, args.fallback)]
+        existing = [b for b in backups if os.path.exists(b)]
+        if existing:
+            raise SystemExit(f"❌ Yedek zaten var: {', '.join(existing)}. Artefaktlar daha önce değiştirilmiş; "
+                             "yedekleri taşıyın ya da --replace olmadan çalıştırın.")
+
+    print("\n🗜️  ARTEFAKT SIKIŞTIRMA")
+    model = joblib.load(args.model)
+    vectorizer = joblib.load(args.vectorizer)
+    fallback = joblib.load(args.fallback) if os.path.exists(args.fallback) else None
+    n_features = vectorizer.transform([""]).shape[1]
+
+    texts, all_genres = parity_split(args.data)
+    leaf_dtype = np.dtype(args.leaf_dtype).type
+
+    def passes(parity, fallback_parity=None):
+        return all(p["max_probability_deviation"] <= args.max_prob_deviation
+                   and -p["flexible_accuracy_delta"] <= args.max_accuracy_drop
+                   for p in (parity, fallback_parity) if p is not None)
+
+    def compact_all(columns):
+        compact = compact_model(copy.deepcopy(model), columns, leaf_dtype)
+        compact_vec = compact_vectorizer(vectorizer, columns)
+        parity = check_parity(model, vectorizer, compact, compact_vec, texts, all_genres)
+        compact_fallback = fallback_parity = None
+        if fallback is not None:
+            compact_fallback = compact_model(copy.deepcopy(fallback), columns, leaf_dtype)
+            fallback_parity = check_parity(fallback, vectorizer, compact_fallback, compact_vec, texts, all_genres)
+        return compact, compact_vec, parity, compact_fallback, fallback_parity
+
+    columns = np.arange(n_features)
+    if not args.no_prune:
+        used = used_features(model, n_features)
+        if fallback is not None:
+            used |= used_features(fallback, n_features)
+        columns = np.flatnonzero(used)
+    compact, compact_vec, parity, compact_fallback, fallback_parity = compact_all(columns)
+
+    pruned_parity = None
+    if not passes(parity, fallback_parity) and len(columns) < n_features:
+        # Budanan terimler satır normunu değiştirir; eşik aşılırsa budamasız sıkıştırmaya dön
+        pruned_parity = {"model": parity, "fallback": fallback_parity}
+        deviation = max(p["max_probability_deviation"] for p in (parity, fallback_parity) if p is not None)
+        print(f"⚠️ Budama ({n_features} -> {len(columns)} terim) olasılıkları "
+              f"{deviation:.3f} kadar kaydırdı; budamasız deneniyor.")
+        columns = np.arange(n_features)
+        compact, compact_vec, parity, compact_fallback, fallback_parity = compact_all(columns)
+    print(f"✂️  Sözlük: {n_features} -> {len(columns)} terim ({n_features - len(columns)} ağırlıksız terim silindi)")
+
+    # Yaz ve ölç
+    model_out = with_suffix(args.model, ".compact")
+    vectorizer_out = with_suffix(args.vectorizer, ".compact")
+    compress = 0 if args.compress == "none" else (args.compress, args.level)
+    joblib.dump(compact, model_out, compress=compress)
+    joblib.dump(compact_vec, vectorizer_out, compress=compress)
+    outputs = [(args.model, model_out), (args.vectorizer, vectorizer_out)]
+    if compact_fallback is not None:
+        fallback_out = with_suffix(args.fallback, ".compact")
+        joblib.dump(compact_fallback, fallback_out, compress=compress)
+        outputs.append((args.fallback, fallback_out))
+
+    report = {
+        "model": type(model).__name__,
+        "features": {"before": int(n_features), "after": int(len(columns))},
+        "compress": args.compress,
+        "leaf_dtype": args.leaf_dtype,
+        "size_bytes": {
+            "before": os.path.getsize(args.model) + os.path.getsize(args.vectorizer),
+            "after": os.path.getsize(model_out) + os.path.getsize(vectorizer_out),
+        },
+        "load_seconds": {
+            "before": round(load_seconds(args.model, args.vectorizer, args.repeat), 4),
+            "after": round(load_seconds(model_out, vectorizer_out, args.repeat), 4),
+        },
+        "parity": parity,
+        "pruned_parity": pruned_parity,
+        "fallback": None if fallback is None else {
+            "model": type(fallback).__name__,
+            "size_bytes": {"before": os.path.getsize(args.fallback), "after": os.path.getsize(fallback_out)},
+            "parity": fallback_parity,
+        },
+    }
+    passed = passes(parity, fallback_parity)
+    report["parity"]["passed"] = passed
+    with open(os.path.join(models_dir, 'compact_report.json'), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    size, load = report["size_bytes"], report["load_seconds"]
+    print(f"📦 Boyut:        {size['before'] / 1024:.0f} KB -> {size['after'] / 1024:.0f} KB")
+    print(f"⏱️  Yükleme:      {load['before'] * 1000:.1f} ms -> {load['after'] * 1000:.1f} ms")
+    print(f"🔍 Olasılık sapması (max): {parity['max_probability_deviation']:.2e}")
+    print(f"🔍 Tahmin uyumu:           %{parity['prediction_agreement'] * 100:.2f} ({parity['rows']} satır)")
+    print(f"🔍 Esnek doğruluk:         %{parity['flexible_accuracy_before'] * 100:.2f} "
+          f"-> %{parity['flexible_accuracy_after'] * 100:.2f}")
+    if fallback_parity is not None:
+        print(f"🔍 Ucuz model sapması (max): {fallback_parity['max_probability_deviation']:.2e}, "
+              f"esnek doğruluk %{fallback_parity['flexible_accuracy_before'] * 100:.2f} "
+              f"-> %{fallback_parity['flexible_accuracy_after'] * 100:.2f}")
+    print("-" * 50)
+
+    if not passed:
+        for _, compacted in outputs:
+            os.remove(compacted)
+        print("❌ Parite eşikleri aşıldı; sıkıştırılmış dosyalar yazılmadı.")
+        sys.exit(1)
+    print(f"✅ Sıkıştırılmış artefaktlar: {', '.join(c for _, c in outputs)}")
+
+    if args.replace:
+        for original, compacted in outputs:
+            os.replace(original, with_suffix(original, ".full"))
+            os.replace(compacted, original)
+        print("✅ final_*.pkl sıkıştırılmış sürümle değiştirildi (orijinaller *.full.pkl).")
+
+
+if __name__ == "__main__":
+    main()
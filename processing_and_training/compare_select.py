@@ -1,6 +1,7 @@
 import joblib
 import pandas as pd
 import os
+from pipeline_profiler import RunProfiler
 
 def compare_and_select():
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,13 +11,16 @@ def compare_and_select():
     pkg_aug_path = os.path.join(models_dir, 'pkg_augmented.pkl')
     final_model_path = os.path.join(models_dir, 'final_best_model.pkl')
     final_vec_path = os.path.join(models_dir, 'final_vectorizer.pkl')
+    final_fallback_path = os.path.join(models_dir, 'final_fallback_model.pkl')
     report_path = os.path.join(models_dir, 'final_report.csv')
 
     print("\n⚖️ KARŞILAŞTIRMA VE FİNAL SEÇİMİ")
+    profiler = RunProfiler("compare")
     
     try:
-        pkg_orig = joblib.load(pkg_orig_path)
-        pkg_aug = joblib.load(pkg_aug_path)
+        with profiler.stage("load_pkgs"):
+            pkg_orig = joblib.load(pkg_orig_path)
+            pkg_aug = joblib.load(pkg_aug_path)
     except FileNotFoundError:
         print("❌ Eğitim dosyaları eksik! Lütfen 2 ve 3 numaralı dosyaları çalıştırın.")
         return
@@ -77,12 +81,19 @@ def compare_and_select():
     print(f"🌟 BAŞARI SKORU (Esnek): %{best_score_overall*100:.2f}")
     
     if winner_package:
-        joblib.dump(winner_package['best_model'], final_model_path)
-        joblib.dump(winner_package['vectorizer'], final_vec_path)
+        with profiler.stage("save_final"):
+            joblib.dump(winner_package['best_model'], final_model_path)
+            joblib.dump(winner_package['vectorizer'], final_vec_path)
+            # Ucuz model aynı vectorizer ile eğitildi; eski pakette yoksa bayat dosyayı bırakma
+            if winner_package.get('fallback_model') is not None:
+                joblib.dump(winner_package['fallback_model'], final_fallback_path)
+            elif os.path.exists(final_fallback_path):
+                os.remove(final_fallback_path)
         print("\n✅ Final model 'final_best_model.pkl' olarak kaydedildi.")
         print("✅ GUI kullanımı için hazırsınız!")
     else:
         print("❌ Hata: Şampiyon seçilemedi.")
+    profiler.save(models_dir)
 
 if __name__ == "__main__":
     compare_and_select()
\ No newline at end of file
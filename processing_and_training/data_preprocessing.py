@@ -1,30 +1,35 @@
 import pandas as pd
 import numpy as np
-import re
 import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 import os
+import sys
 import csv
+import json
+from near_duplicates import NearDuplicateIndex, text_key
+from pipeline_profiler import RunProfiler
+
+# Eğitim ve servis aynı normalizasyon modülünü kullanır (backend/text_normalization.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')))
+from text_normalization import LEMMA_TABLE_PATH, LemmaTable, nltk_lemmatizer, normalize
 
 try:
-    nltk.data.find('corpora/stopwords')
+    nltk.data.find('corpora/wordnet')
 except LookupError:
-    nltk.download('stopwords', quiet=True)
     nltk.download('wordnet', quiet=True)
     nltk.download('omw-1.4', quiet=True)
 
+# Poe yakın kopya tespiti: tahmini Jaccard benzerliği bu eşiğin üzerindeyse satır atılır
+DEDUP_THRESHOLD = float(os.environ.get("CINEAI_DEDUP_THRESHOLD", "0.8"))
+DEDUP_NUM_PERM = int(os.environ.get("CINEAI_DEDUP_NUM_PERM", "128"))
+if not 0 < DEDUP_THRESHOLD <= 1:
+    raise ValueError(f"CINEAI_DEDUP_THRESHOLD 0 < eşik <= 1 olmalı: {DEDUP_THRESHOLD}")
+
+# WordNetLemmatizer bir kez kurulur; her kelimenin lemması bir kez hesaplanıp tabloya yazılır
+LEMMAS = LemmaTable(fallback=nltk_lemmatizer())
+
 def clean_text_english(text):
     if pd.isna(text) or text == "": return ""
-    text = str(text)[:2500]
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\d+', '', text)
-    stop_words = set(stopwords.words('english'))
-    lemmatizer = WordNetLemmatizer()
-    words = text.split()
-    cleaned = [lemmatizer.lemmatize(w) for w in words if w not in stop_words]
-    return " ".join(cleaned)
+    return normalize(text, LEMMAS)
 
 # --- STRATEJİ: TÜRLERİ GRUPLA ---
 def group_genres(genre):
@@ -47,6 +52,72 @@ def group_genres(genre):
     else:
         return 'Other'
 
+def drop_poe_near_duplicates(df, is_poe, data_dir):
+    """
+    IMDb satırlarını referans alarak, onlara ya da daha önceki Poe satırlarına yakın
+    kopya olan Poe satırlarını atar. Index data/poe_minhash_index.npz'de saklanır;
+    dosyaya yeni Poe partileri eklendiğinde yalnızca yeni satırlar imzalanır.
+    Atılan kümeler data/poe_dedup_report.json'a yazılır.
+    """
+    index_path = os.path.join(data_dir, 'poe_minhash_index.npz')
+    report_path = os.path.join(data_dir, 'poe_dedup_report.json')
+
+    index = NearDuplicateIndex.load(index_path, threshold=DEDUP_THRESHOLD, num_perm=DEDUP_NUM_PERM)
+    index.add_reference(df.loc[~is_poe, 'clean_text'])
+    poe = df[is_poe]
+    matches = index.deduplicate(poe['clean_text'])
+    index.save(index_path)
+
+    # Tutulan metnin ilk geçtiği satır (IMDb önce geldiği için IMDb satırı tercih edilir)
+    first_rows = {}
+    for row, text in zip(df.index, df['clean_text']):
+        first_rows.setdefault(text_key(text), row)
+
+    poe_rows = set(poe.index)
+
+    def describe(row):
+        return {"source": "poe" if row in poe_rows else "imdb",
+                "genre": df.at[row, 'genre'], "plot": df.at[row, 'plot']}
+
+    clusters, dropped = {}, []
+    for row, match in zip(poe.index, matches):
+        if match is None:
+            continue
+        kept_key, similarity = match
+        dropped.append(row)
+        clusters.setdefault(kept_key, []).append(
+            {"genre": df.at[row, 'genre'], "similarity": round(similarity, 3), "plot": df.at[row, 'plot']})
+
+    report_clusters = []
+    for kept_key, removed in sorted(clusters.items(), key=lambda item: -len(item[1])):
+        kept_row = first_rows.get(kept_key)
+        kept = describe(kept_row) if kept_row is not None else {"source": "önceki parti"}
+        report_clusters.append({
+            "kept": kept,
+            "removed_count": len(removed),
+            "genre_conflict": any(r["genre"] != kept.get("genre") for r in removed),
+            "removed": removed,
+        })
+
+    exact = sum(1 for m in matches if m is not None and m[1] == 1.0)
+    against_imdb = sum(len(c["removed"]) for c in report_clusters if c["kept"]["source"] == "imdb")
+    report = {
+        "params": index.params(),
+        "lsh": {"bands": index.bands, "rows": index.rows},
+        "poe_rows": len(poe),
+        "removed": len(dropped),
+        "exact_or_identical_signature": exact,
+        "near_duplicates": len(dropped) - exact,
+        "removed_against_imdb": against_imdb,
+        "clusters": report_clusters,
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"🧹 Poe yakın kopyaları (eşik {DEDUP_THRESHOLD}): {len(dropped)}/{len(poe)} satır atıldı "
+          f"({len(report_clusters)} küme, {against_imdb} tanesi IMDb kopyası). Rapor: {report_path}")
+    return df.drop(index=dropped)
+
 def process_data():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.abspath(os.path.join(current_dir, '..', 'data'))
@@ -55,6 +126,8 @@ def process_data():
     poe_path = os.path.join(data_dir, 'poe_verisi.csv')
     out_orig_path = os.path.join(data_dir, 'processed_original.csv')
     out_aug_path = os.path.join(data_dir, 'processed_augmented.csv')
+    models_dir = os.path.abspath(os.path.join(current_dir, '..', 'models'))
+    profiler = RunProfiler("preprocessing")
 
     print(f"📂 Çalışma Dizini: {data_dir}")
     print("\n⏳ ADIM 1: Veriler Hazırlanıyor ve GRUPLANIYOR...")
@@ -64,7 +137,8 @@ def process_data():
         print(f"❌ HATA: {imdb_path} bulunamadı!")
         return
 
-    df_imdb = pd.read_csv(imdb_path, on_bad_lines='skip')
+    with profiler.stage("read_imdb"):
+        df_imdb = pd.read_csv(imdb_path, on_bad_lines='skip')
     df_orig = df_imdb[['Plot', 'Genre']].rename(columns={'Plot': 'plot', 'Genre': 'all_genres'})
     df_orig.dropna(inplace=True)
     
@@ -78,11 +152,13 @@ def process_data():
     df_orig = df_orig[df_orig['genre'] != 'Other']
     
     # Temizlik
-    df_orig['clean_text'] = df_orig['plot'].apply(clean_text_english)
+    with profiler.stage("clean_text_original"):
+        df_orig['clean_text'] = df_orig['plot'].apply(clean_text_english)
     df_orig = df_orig[df_orig['clean_text'].str.len() > 2]
     
     # Orijinali kaydet
-    df_orig.to_csv(out_orig_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
+    with profiler.stage("write_original"):
+        df_orig.to_csv(out_orig_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
     print(f"✅ Orijinal Veri (Gruplanmış) Hazır: {len(df_orig)} satır.")
 
     # --- 2. POE VERİSİ ---
@@ -90,7 +166,8 @@ def process_data():
     df_combined = df_orig.copy()
 
     if os.path.exists(poe_path):
-        df_poe = pd.read_csv(poe_path, on_bad_lines='skip')
+        with profiler.stage("read_poe"):
+            df_poe = pd.read_csv(poe_path, on_bad_lines='skip')
         df_poe.columns = [c.strip().lower() for c in df_poe.columns]
         
         rename_map = {}
@@ -111,8 +188,14 @@ def process_data():
             df_combined = pd.concat([df_orig[cols], df_poe[cols]], ignore_index=True)
             
             # Temizle
-            df_combined['clean_text'] = df_combined['plot'].apply(clean_text_english)
+            with profiler.stage("clean_text_augmented"):
+                df_combined['clean_text'] = df_combined['plot'].apply(clean_text_english)
             df_combined = df_combined[df_combined['clean_text'].str.len() > 2]
+
+            # Poe satırlarındaki (birebir ve yakın) kopyaları at
+            is_poe = df_combined.index >= len(df_orig)
+            with profiler.stage("dedup_poe"):
+                df_combined = drop_poe_near_duplicates(df_combined, is_poe, data_dir)
             
             print(f"✅ Poe verisi eklendi. Toplam: {len(df_combined)} satır.")
         else:
@@ -121,8 +204,15 @@ def process_data():
         print("⚠️ Poe dosyası yok.")
 
     # KAYDET
-    df_combined.to_csv(out_aug_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
+    with profiler.stage("write_augmented"):
+        df_combined.to_csv(out_aug_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
     print(f"✅ Birleştirilmiş Veri (Gruplanmış) Hazır: {out_aug_path}")
+    
+    if not os.path.exists(models_dir): os.makedirs(models_dir)
+    # Servis tarafı NLTK yüklemeden aynı lemmaları kullanabilsin
+    LEMMAS.save(LEMMA_TABLE_PATH)
+    print(f"✅ Lemma tablosu kaydedildi ({len(LEMMAS)} kelime): {LEMMA_TABLE_PATH}")
+    profiler.save(models_dir)
 
 if __name__ == "__main__":
     process_data()
\ No newline at end of file
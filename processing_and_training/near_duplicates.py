@@ -0,0 +1,198 @@
+"""
+CineAI Pro - MinHash/LSH ile Yakın Kopya Tespiti
+
+Poe ile üretilen sentetik özetler birbirinin (ve IMDb özetlerinin) neredeyse aynısı
+olabilir. Bu modül `clean_text` üzerindeki kelime üçlülerinin (shingle) Jaccard
+benzerliğini MinHash imzalarıyla tahmin eder; LSH bantları sayesinde her metin
+yalnızca aynı kovaya düşen adaylarla karşılaştırılır (n^2 yerine ~n).
+
+Açgözlü ve artımlı çalışır: metinler sırayla işlenir, daha önce tutulan bir metne
+`threshold` üzerinde benzeyen metin atılır. Tutulan metinler bir daha atılmaz; bu
+yüzden index diske kaydedilip yeni Poe partileri geldiğinde yalnızca yeni satırlar
+imzalanır ve mevcut index'e karşı sorgulanır.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+
+import numpy as np
+
+# 2^32'den küçük en büyük asal: (a * h + b) mod p, uint64'te taşmadan hesaplanır
+_PRIME = np.uint64(4294967291)
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def lsh_params(threshold: float, num_perm: int):
+    """
+    b bant x r satır seçimi. S-eğrisinin eşiği ~ (1/b)^(1/r); aday kaçırmamak için
+    eşiğin hemen altında kalan en yüksek değer seçilir (yanlış adaylar imzayla elenir).
+    Eşik 1/num_perm'in altındaysa en hassas ayar (num_perm bant x 1 satır) kullanılır.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Yakın kopya eşiği 0 < eşik <= 1 olmalı: {threshold}")
+    best = (num_perm, 1, 1 / num_perm)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        approx = (1 / bands) ** (1 / rows)
+        if approx <= threshold and approx > best[2]:
+            best = (bands, rows, approx)
+    return best[0], best[1]
+
+
+class NearDuplicateIndex:
+    """Tutulan metinlerin MinHash imzaları ve LSH kovaları"""
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=3, seed=42):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._keys = []              # tutulan metinlerin anahtarları (imza sırasıyla)
+        self._signatures = []
+        self._positions = {}         # anahtar -> imza sırası
+        self._references = set()     # referans (IMDb) anahtarları - bunların birebir kopyası hep atılır
+        self._duplicates = {}        # atılan anahtar -> (tutulan anahtar, benzerlik)
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def __len__(self):
+        return len(self._keys)
+
+    # --- İMZA ---
+    def shingles(self, text: str):
+        words = text.split()
+        n = self.shingle_size
+        if len(words) <= n:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in self.shingles(text)), dtype=np.uint64
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    # --- LSH ---
+    def _band_keys(self, signature):
+        r = self.rows
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def _insert(self, key, signature):
+        position = len(self._keys)
+        self._keys.append(key)
+        self._signatures.append(signature)
+        self._positions[key] = position
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band, []).append(position)
+
+    def query(self, signature):
+        """En benzer tutulan metin: (anahtar, tahmini Jaccard) veya eşik altında ise None"""
+        candidates = set()
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band, ()))
+        if not candidates:
+            return None
+        candidates = list(candidates)
+        stacked = np.stack([self._signatures[i] for i in candidates])
+        similarity = (stacked == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] < self.threshold:
+            return None
+        return self._keys[candidates[best]], float(similarity[best])
+
+    # --- TOPLU İŞLEM ---
+    def add_reference(self, texts):
+        """Hiçbir zaman atılmayacak metinler (IMDb): yalnızca index'e eklenir"""
+        for text in texts:
+            key = text_key(text)
+            self._references.add(key)
+            if key not in self._positions:
+                self._insert(key, self.signature(text))
+
+    def deduplicate(self, texts):
+        """
+        Metinleri sırayla işler. Her metin için (tutulan anahtar, benzerlik) döner;
+        metin tutulduysa None. Referans metinlerin birebir kopyaları her zaman atılır.
+        Daha önceki çalıştırmalarda görülen metinlerin kararı yeniden hesaplanmadan
+        index'ten okunur.
+        """
+        results, seen = [], {}
+        for text in texts:
+            key = text_key(text)
+            if key in seen:
+                # Aynı çalıştırmada birebir tekrar: ilk geçişin kararını devralır
+                first = seen[key]
+                results.append((key, 1.0) if first is None else first)
+                continue
+            if key in self._references:
+                match = (key, 1.0)
+            elif key in self._positions:
+                # Önceki bir çalıştırmada tutulan Poe metni
+                match = None
+            else:
+                match = self._match(key, text)
+            seen[key] = match
+            results.append(match)
+        return results
+
+    def _match(self, key, text):
+        """Yeni bir metnin kararı: tutulursa index'e eklenir ve None döner"""
+        if key in self._duplicates:
+            return self._duplicates[key]
+        signature = self.signature(text)
+        match = self.query(signature)
+        if match is None:
+            self._insert(key, signature)
+        else:
+            self._duplicates[key] = match
+        return match
+
+    # --- KALICILIK ---
+    def params(self):
+        return {"threshold": self.threshold, "num_perm": self.num_perm,
+                "shingle_size": self.shingle_size, "seed": self.seed}
+
+    def save(self, path):
+        duplicates = {k: list(v) for k, v in self._duplicates.items()}
+        signatures = np.stack(self._signatures) if self._signatures else np.zeros((0, self.num_perm), np.uint32)
+        # Önce geçici dosyaya yaz, sonra atomik olarak değiştir
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path, signatures=signatures, keys=np.array(self._keys),
+            references=np.array([key in self._references for key in self._keys], dtype=bool),
+            meta=np.array(json.dumps({"params": self.params(), "duplicates": duplicates})),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **params):
+        """
+        Kayıtlı index'i yükler. Dosya yoksa ya da parametreler (eşik, num_perm...)
+        değiştiyse boş index döner ve her şey baştan imzalanır.
+        """
+        index = cls(**params)
+        if not os.path.exists(path):
+            return index
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["params"] != index.params() or "references" not in data.files:
+                print(f"⚠️ Yakın kopya index'i farklı parametrelerle üretilmiş, yeniden oluşturuluyor: {path}")
+                return index
+            for key, signature, is_reference in zip(data["keys"].tolist(), data["signatures"], data["references"]):
+                index._insert(key, signature)
+                if is_reference:
+                    index._references.add(key)
+        index._duplicates = {k: (v[0], v[1]) for k, v in meta["duplicates"].items()}
+        return index
@@ -0,0 +1,222 @@
+"""
+Eğitim hattı için ortak ölçüm katmanı.
+
+Her aşama ve model için duvar saati, CPU süresi ve tepe bellek (RSS) kaydeder,
+sonucu pkg_*.pkl dosyalarının yanına JSON rapor olarak yazar ve iki raporu
+karşılaştırarak performans gerilemelerini bulur.
+
+Kullanım:
+    profiler = RunProfiler("augmented")
+    with profiler.stage("tfidf_fit"):
+        ...
+    with profiler.stage("cv", model="SVM"):
+        ...
+    profiler.save(models_dir)
+
+    python pipeline_profiler.py diff eski_rapor.json yeni_rapor.json --threshold 0.2
+    python pipeline_profiler.py diff ../models/run_report_augmented.prev.json ../models/run_report_augmented.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mib():
+    """Sürecin güncel RSS'i (Linux'ta /proc, diğerlerinde tepe değer)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 2**20
+    except OSError:
+        return peak_rss_mib()
+
+
+def peak_rss_mib():
+    """Süreç başından beri tepe RSS (macOS'ta byte, Linux'ta KiB döner)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class _RssSampler(threading.Thread):
+    """Aşama süresince RSS'i örnekleyip en yüksek değeri tutar"""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mib()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mib())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, current_rss_mib())
+
+
+class RunProfiler:
+    """Bir eğitim/ön işleme çalıştırmasının aşama ölçümlerini toplar"""
+
+    def __init__(self, run_name, sample_interval=0.05):
+        self.run_name = run_name
+        self.sample_interval = sample_interval
+        self.records = []
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, name, model=None):
+        """Bloğun duvar/CPU süresini ve tepe RSS'ini kaydeder"""
+        sampler = _RssSampler(self.sample_interval)
+        sampler.start()
+        rss_before = current_rss_mib()
+        children_before = os.times()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            children_after = os.times()
+            sampler.stop()
+            # joblib/loky alt süreçlerinin CPU'su (sonlanmış çocuklar için)
+            child_cpu = (children_after.children_user - children_before.children_user
+                         + children_after.children_system - children_before.children_system)
+            record = {
+                "stage": name,
+                "model": model,
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(cpu + child_cpu, 4),
+                "peak_rss_mib": round(sampler.peak, 1),
+                "rss_delta_mib": round(current_rss_mib() - rss_before, 1),
+            }
+            self.records.append(record)
+            label = f"{name} [{model}]" if model else name
+            print(f"⏱️  {label}: {wall:.2f}s duvar, {record['cpu_seconds']:.2f}s CPU, "
+                  f"tepe {record['peak_rss_mib']:.0f} MiB")
+
+    def report(self):
+        return {
+            "run": self.run_name,
+            "started_at": self.started_at,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "total_wall_seconds": round(time.perf_counter() - self._wall_start, 4),
+            "total_cpu_seconds": round(time.process_time() - self._cpu_start, 4),
+            "peak_rss_mib": round(peak_rss_mib(), 1),
+            "stages": self.records,
+        }
+
+    def save(self, models_dir):
+        """
+        Raporu models_dir/run_report_<run>.json olarak yazar.
+        Önceki rapor .prev.json olarak saklanır, böylece iki çalıştırma hemen karşılaştırılabilir.
+        """
+        path = os.path.join(models_dir, f"run_report_{self.run_name}.json")
+        if os.path.exists(path):
+            shutil.copyfile(path, os.path.join(models_dir, f"run_report_{self.run_name}.prev.json"))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        print(f"📝 Performans raporu kaydedildi: {path}")
+        return path
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _key(record):
+    return f"{record['stage']} [{record['model']}]" if record.get("model") else record["stage"]
+
+
+def diff_reports(old, new, threshold=0.2, min_seconds=0.5):
+    """
+    İki raporu aşama/model bazında karşılaştırır.
+    Süresi `threshold` oranından fazla artan (ve en az `min_seconds` uzayan)
+    ya da tepe belleği aynı oranda büyüyen aşamaları gerileme olarak döndürür.
+    """
+    old_stages = {_key(r): r for r in old["stages"]}
+    rows, regressions = [], []
+    for record in new["stages"]:
+        key = _key(record)
+        before = old_stages.get(key)
+        if before is None:
+            rows.append((key, None, record))
+            continue
+        rows.append((key, before, record))
+        for metric, floor in (("wall_seconds", min_seconds), ("cpu_seconds", min_seconds), ("peak_rss_mib", 16)):
+            a, b = before[metric], record[metric]
+            if a > 0 and (b - a) / a > threshold and (b - a) >= floor:
+                regressions.append((key, metric, a, b))
+    return rows, regressions
+
+
+def _print_diff(old, new, rows, regressions):
+    print(f"📊 {old['run']} ({old['commit']}) -> {new['run']} ({new['commit']})")
+    print(f"{'Aşama':<40} {'Duvar (s)':>22} {'CPU (s)':>22} {'Tepe RSS (MiB)':>24}")
+    for key, before, after in rows:
+        cells = []
+        for metric in ("wall_seconds", "cpu_seconds", "peak_rss_mib"):
+            if before is None:
+                cells.append(f"{'yeni':>10} -> {after[metric]:>9}")
+            else:
+                cells.append(f"{before[metric]:>10} -> {after[metric]:>9}")
+        print(f"{key:<40} {cells[0]:>22} {cells[1]:>22} {cells[2]:>24}")
+    print(f"{'TOPLAM':<40} {old['total_wall_seconds']:>10} -> {new['total_wall_seconds']:>9}")
+    print("-" * 50)
+    if regressions:
+        print("❌ Gerileme tespit edildi:")
+        for key, metric, a, b in regressions:
+            print(f"   {key}: {metric} {a} -> {b} ({(b - a) / a * 100:+.1f}%)")
+    else:
+        print("✅ Gerileme yok.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eğitim hattı performans raporları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff_parser = sub.add_parser("diff", help="İki run raporunu karşılaştır")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    diff_parser.add_argument("--threshold", type=float, default=0.2, help="Gerileme sayılacak artış oranı")
+    diff_parser.add_argument("--min-seconds", type=float, default=0.5, help="Yok sayılacak mutlak süre farkı")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows, regressions = diff_reports(old, new, args.threshold, args.min_seconds)
+    _print_diff(old, new, rows, regressions)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
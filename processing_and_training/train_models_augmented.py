@@ -2,10 +2,10 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.svm import LinearSVC
 from sklearn.ensemble import RandomForestClassifier, VotingClassifier
@@ -13,6 +13,12 @@ from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import (accuracy_score, f1_score, precision_score, recall_score, 
                              roc_auc_score, confusion_matrix, classification_report, roc_curve, auc)
 from sklearn.preprocessing import LabelBinarizer
+from pipeline_profiler import RunProfiler
+
+# TF-IDF ve özellik seçimi servisle paylaşılan modülden (backend/feature_selection.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')))
+from feature_selection import (FEATURE_K, FEATURE_SELECTION, make_selector, make_tfidf,
+                               package_vectorizer, with_selection)
 
 # --- YARDIMCI: GRUPLAMA MANTIĞI (Preprocessing ile aynı olmalı) ---
 def group_genres(genre):
@@ -54,6 +60,21 @@ def calculate_flexible_accuracy(y_true_all_genres, y_pred):
             
     return correct_count / total_count
 
+# --- VERİ AYRIMI (eğitim, özellik seçimi benchmark'ı ve artefakt parite kontrolü ortak) ---
+MIN_GENRE_COUNT = 50
+
+def split_train_test(df, min_count=MIN_GENRE_COUNT):
+    """
+    En az `min_count` örneği olan türleri tutar ve %80/%20 katmanlı ayrım yapar.
+    (train_df, test_df, çıkarılan türler) döndürür.
+    """
+    v_counts = df['genre'].value_counts()
+    valid_genres = v_counts[v_counts >= min_count].index.tolist()
+    dropped = [g for g in df['genre'].unique() if g not in valid_genres]
+    df = df[df['genre'].isin(valid_genres)]
+    train_df, test_df = train_test_split(df, test_size=0.2, random_state=42, stratify=df['genre'])
+    return train_df, test_df, dropped
+
 def plot_confusion_matrix(y_true, y_pred, classes, model_name, save_dir):
     cm = confusion_matrix(y_true, y_pred, labels=classes)
     plt.figure(figsize=(12, 10))
@@ -126,17 +147,13 @@ def train_augmented():
         print(f"❌ HATA: Dosya bulunamadı! Lütfen data_preprocessing.py çalıştırın.")
         return
 
-    df = pd.read_csv(csv_path)
+    profiler = RunProfiler("augmented")
+    with profiler.stage("read_csv"):
+        df = pd.read_csv(csv_path)
     
-    # 1. YETERSİZ VERİ TEMİZLİĞİ
-    min_count = 50
-    v_counts = df['genre'].value_counts()
-    valid_genres = v_counts[v_counts >= min_count].index.tolist()
-    print(f"ℹ️ Yetersiz verisi olan türler çıkarılıyor (<{min_count}): {[g for g in df['genre'].unique() if g not in valid_genres]}")
-    df = df[df['genre'].isin(valid_genres)]
-
-    # 2. VERİYİ AYIRMA
-    train_df, test_df = train_test_split(df, test_size=0.2, random_state=42, stratify=df['genre'])
+    # 1. YETERSİZ VERİ TEMİZLİĞİ ve 2. VERİYİ AYIRMA
+    train_df, test_df, dropped = split_train_test(df)
+    print(f"ℹ️ Yetersiz verisi olan türler çıkarılıyor (<{MIN_GENRE_COUNT}): {dropped}")
 
     X_train = train_df['clean_text'].fillna("")
     y_train = train_df['genre'] 
@@ -148,9 +165,23 @@ def train_augmented():
     classes = y_train.unique()
 
     # 3. GÜÇLÜ VEKTÖRLEŞTİRME
-    tfidf = TfidfVectorizer(max_features=10000, ngram_range=(1, 2), min_df=3, sublinear_tf=True)
-    X_train_vec = tfidf.fit_transform(X_train)
-    X_test_vec = tfidf.transform(X_test)
+    tfidf = make_tfidf()
+    with profiler.stage("tfidf_fit"):
+        X_train_vec = tfidf.fit_transform(X_train)
+    with profiler.stage("tfidf_transform"):
+        X_test_vec = tfidf.transform(X_test)
+
+    # Özellik seçimi (CINEAI_FEATURE_SELECTION): CV'de her katmanda yeniden eğitilir,
+    # final modeller için tüm eğitim verisiyle bir kez eğitilip vektörleştiriciyle saklanır
+    selector = make_selector()
+    if selector is not None:
+        with profiler.stage("feature_select"):
+            X_train_sel = selector.fit_transform(X_train_vec, y_train)
+            X_test_sel = selector.transform(X_test_vec)
+        print(f"✂️  Özellik seçimi ({FEATURE_SELECTION}, k={FEATURE_K}): "
+              f"{X_train_vec.shape[1]} -> {X_train_sel.shape[1]} özellik")
+    else:
+        X_train_sel, X_test_sel = X_train_vec, X_test_vec
     
     # 4. TÜM MODELLERİ TANIMLIYORUZ
     
@@ -182,18 +213,22 @@ def train_augmented():
         print(f"\n⚙️  {name} Eğitiliyor...")
         
         # Cross-Validation
-        cv_scores = cross_val_score(model, X_train_vec, y_train, cv=3, scoring='f1_weighted')
+        with profiler.stage("cv", model=name):
+            cv_scores = cross_val_score(with_selection(model, selector), X_train_vec, y_train, cv=3, scoring='f1_weighted')
         val_f1 = cv_scores.mean()
 
-        model.fit(X_train_vec, y_train)
-        y_pred = model.predict(X_test_vec)
-        y_proba = model.predict_proba(X_test_vec)
+        with profiler.stage("fit", model=name):
+            model.fit(X_train_sel, y_train)
+        with profiler.stage("predict", model=name):
+            y_pred = model.predict(X_test_sel)
+            y_proba = model.predict_proba(X_test_sel)
         
-        # Standart Metrikler
-        metrics = calculate_metrics(y_test_primary, y_pred, y_proba, classes)
+        # Standart Metrikler ve esnek doğruluk
+        with profiler.stage("metrics", model=name):
+            metrics = calculate_metrics(y_test_primary, y_pred, y_proba, classes)
         
-        # ESNEK DOĞRULUK (FLEXIBLE ACCURACY)
-        flex_acc = calculate_flexible_accuracy(y_test_all_genres, y_pred)
+            # ESNEK DOĞRULUK (FLEXIBLE ACCURACY)
+            flex_acc = calculate_flexible_accuracy(y_test_all_genres, y_pred)
         
         metrics["Validation F1"] = val_f1
         metrics["Flexible Accuracy"] = flex_acc
@@ -211,8 +246,9 @@ def train_augmented():
         print("📝 Sınıflandırma Raporu (Standart):")
         print(classification_report(y_test_primary, y_pred, zero_division=0))
         
-        plot_confusion_matrix(y_test_primary, y_pred, classes, name, plots_dir)
-        plot_roc_curve(y_test_primary, y_proba, classes, name, plots_dir)
+        with profiler.stage("plots", model=name):
+            plot_confusion_matrix(y_test_primary, y_pred, classes, name, plots_dir)
+            plot_roc_curve(y_test_primary, y_proba, classes, name, plots_dir)
         print(f"🖼️  Grafikler kaydedildi: {plots_dir}")
         
         # Şampiyon Seçimi (Esnek Accuracy'ye göre)
@@ -223,10 +259,14 @@ def train_augmented():
     data_to_save = {
         "results": results,
         "best_model": best_model_obj,
-        "vectorizer": tfidf
+        "vectorizer": package_vectorizer(tfidf, selector),
+        # API yük altındayken (CINEAI_DEGRADED_MODE=cheap_model) en ucuz modele düşer
+        "fallback_model": nb
     }
-    joblib.dump(data_to_save, save_path)
+    with profiler.stage("save_pkg"):
+        joblib.dump(data_to_save, save_path)
     print(f"\n✅ Eğitim tamamlandı. Paket: {save_path}")
+    profiler.save(models_dir)
 
 if __name__ == "__main__":
     train_augmented()
\ No newline at end of file
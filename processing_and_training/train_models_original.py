@@ -2,10 +2,10 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.svm import LinearSVC
 from sklearn.ensemble import RandomForestClassifier
@@ -13,6 +13,12 @@ from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import (accuracy_score, f1_score, precision_score, recall_score, 
                              roc_auc_score, confusion_matrix, classification_report, roc_curve, auc)
 from sklearn.preprocessing import LabelBinarizer
+from pipeline_profiler import RunProfiler
+
+# TF-IDF ve özellik seçimi servisle paylaşılan modülden (backend/feature_selection.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')))
+from feature_selection import (FEATURE_K, FEATURE_SELECTION, make_selector, make_tfidf,
+                               package_vectorizer, with_selection)
 
 def plot_confusion_matrix(y_true, y_pred, classes, model_name, save_dir):
     """Confusion Matrix çizer ve kaydeder."""
@@ -91,7 +97,9 @@ def train_original():
         print(f"❌ HATA: Dosya bulunamadı -> {csv_path}")
         return
 
-    df = pd.read_csv(csv_path)
+    profiler = RunProfiler("original")
+    with profiler.stage("read_csv"):
+        df = pd.read_csv(csv_path)
     
     # 1. YETERSİZ VERİ TEMİZLİĞİ (En az 50 örnek)
     min_count = 50
@@ -107,9 +115,23 @@ def train_original():
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
     
     # 2. GÜÇLÜ VEKTÖRLEŞTİRME
-    tfidf = TfidfVectorizer(max_features=10000, ngram_range=(1, 2), min_df=3, sublinear_tf=True)
-    X_train_vec = tfidf.fit_transform(X_train)
-    X_test_vec = tfidf.transform(X_test)
+    tfidf = make_tfidf()
+    with profiler.stage("tfidf_fit"):
+        X_train_vec = tfidf.fit_transform(X_train)
+    with profiler.stage("tfidf_transform"):
+        X_test_vec = tfidf.transform(X_test)
+
+    # Özellik seçimi (CINEAI_FEATURE_SELECTION): CV'de her katmanda yeniden eğitilir,
+    # final modeller için tüm eğitim verisiyle bir kez eğitilip vektörleştiriciyle saklanır
+    selector = make_selector()
+    if selector is not None:
+        with profiler.stage("feature_select"):
+            X_train_sel = selector.fit_transform(X_train_vec, y_train)
+            X_test_sel = selector.transform(X_test_vec)
+        print(f"✂️  Özellik seçimi ({FEATURE_SELECTION}, k={FEATURE_K}): "
+              f"{X_train_vec.shape[1]} -> {X_train_sel.shape[1]} özellik")
+    else:
+        X_train_sel, X_test_sel = X_train_vec, X_test_vec
     
     # 3. DENGESİZLİK AYARLI MODELLER
     models = {
@@ -126,16 +148,20 @@ def train_original():
         print(f"\n⚙️  {name} EĞİTİLİYOR VE ANALİZ EDİLİYOR...")
         
         # Cross-Validation Skoru (Gerçek başarı)
-        cv_scores = cross_val_score(model, X_train_vec, y_train, cv=5, scoring='f1_weighted')
+        with profiler.stage("cv", model=name):
+            cv_scores = cross_val_score(with_selection(model, selector), X_train_vec, y_train, cv=5, scoring='f1_weighted')
         val_f1 = cv_scores.mean()
 
         # Tam Eğitim
-        model.fit(X_train_vec, y_train)
-        y_pred = model.predict(X_test_vec)
-        y_proba = model.predict_proba(X_test_vec)
+        with profiler.stage("fit", model=name):
+            model.fit(X_train_sel, y_train)
+        with profiler.stage("predict", model=name):
+            y_pred = model.predict(X_test_sel)
+            y_proba = model.predict_proba(X_test_sel)
         
         # Metrikler
-        metrics = calculate_metrics(y_test, y_pred, y_proba, classes)
+        with profiler.stage("metrics", model=name):
+            metrics = calculate_metrics(y_test, y_pred, y_proba, classes)
         metrics["Validation F1"] = val_f1
         results[name] = metrics
         
@@ -150,8 +176,9 @@ def train_original():
         print("📝 Sınıflandırma Raporu:")
         print(classification_report(y_test, y_pred, zero_division=0)) 
         
-        plot_confusion_matrix(y_test, y_pred, classes, name, plots_dir)
-        plot_roc_curve(y_test, y_proba, classes, name, plots_dir)
+        with profiler.stage("plots", model=name):
+            plot_confusion_matrix(y_test, y_pred, classes, name, plots_dir)
+            plot_roc_curve(y_test, y_proba, classes, name, plots_dir)
         print(f"🖼️  Grafikler kaydedildi: {plots_dir}")
 
         if metrics['F1'] > best_f1:
@@ -161,10 +188,14 @@ def train_original():
     data_to_save = {
         "results": results,
         "best_model": best_model_obj,
-        "vectorizer": tfidf
+        "vectorizer": package_vectorizer(tfidf, selector),
+        # API yük altındayken (CINEAI_DEGRADED_MODE=cheap_model) en ucuz modele düşer
+        "fallback_model": models["Naive Bayes"]
     }
-    joblib.dump(data_to_save, save_path)
+    with profiler.stage("save_pkg"):
+        joblib.dump(data_to_save, save_path)
     print(f"\n✅ Eğitim tamamlandı. Paket: {save_path}")
+    profiler.save(models_dir)
 
 if __name__ == "__main__":
     train_original()
\ No newline at end of file